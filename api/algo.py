@@ -1,7 +1,9 @@
-from math import sqrt
+import time
+from math import sqrt, inf
 from collections import deque
 from heapq import heappush, heappop
 from api.maze import Coordinate, MazeSymbol
+from api.rsr import decompose, expand_path, MIN_INTERIOR_RATIO
 
 class Stack:
     def __init__(self):
@@ -56,6 +58,9 @@ class PriorityQueue:
     def pop(self):
         return heappop(self._container)
 
+    def peek(self):
+        return self._container[0]
+
     def __repr__(self):
         return repr(self._container)
 
@@ -76,6 +81,18 @@ class Move:
         return (self.cost + self.heuristic) < (other.cost + other.heuristic)
 
 
+class DeepestMove(Move):
+    def __lt__(self, other):
+        """
+        Same ordering as Move, with ties going to the move furthest from the start.
+
+        On grids many cells share the optimal f-value, and without a
+        tie-break a search can sweep all of them before reaching the end.
+        """
+        f, other_f = self.cost + self.heuristic, other.cost + other.heuristic
+        return f < other_f or (f == other_f and self.cost > other.cost)
+
+
 def manhattan_distance(finish):
     # Simple Manhattan distance heuristic
     def distance(loc):
@@ -197,7 +214,7 @@ def a_star(maze, heuristic_func, return_weights=False):
         
         # Explore neighbors
         for neighbor in maze.get_neighbors(active):
-            new_cost = loc.cost + 1
+            new_cost = loc.cost + maze.step_cost(active, neighbor)
             
             # Update cost if a shorter path is found
             if neighbor not in visited_node or visited_node[neighbor] > new_cost:
@@ -292,7 +309,7 @@ def bidirectional_heuristic_search(maze, heuristic_func, return_weights=False):
         
         # Explore neighbors for A* from the start node
         for neighbor in maze.get_neighbors(active):
-            new_cost = loc.cost + 1
+            new_cost = loc.cost + maze.step_cost(active, neighbor)
             
             # Update cost if a shorter path is found
             if neighbor not in visited_node or visited_node[neighbor] > new_cost:
@@ -301,7 +318,7 @@ def bidirectional_heuristic_search(maze, heuristic_func, return_weights=False):
         
         # Explore neighbors for A* from the end node
         for neighbor in maze.get_neighbors(active2):
-            new_cost = loc2.cost + 1
+            new_cost = loc2.cost + maze.step_cost(active2, neighbor)
             
             # Update cost if a shorter path is found
             if neighbor not in visited_node2 or visited_node2[neighbor] > new_cost:
@@ -483,4 +500,244 @@ def jump_point_search(maze, heuristic_func, return_weights=False):
 
     # Return None if no maze solution is found
     if return_weights: return None, None, visited_node
-    return None, None
\ No newline at end of file
+    return None, None
+
+
+# Rectangular Symmetry Reduction (RSR) - A* over rectangle perimeters
+def rectangular_symmetry_reduction(maze, heuristic_func, return_weights=False):
+    """
+    A* on the perimeters of the maze's obstacle-free rectangles.
+
+    Open areas are split into rectangles once per wall layout (see api/rsr.py)
+    and only their perimeter cells are expanded, with macro-edges crossing the
+    interiors. The path found is as short as plain A* and is expanded back to
+    every cell it passes through.
+
+    It pays off on boards with open areas. When too few cells lie inside a
+    rectangle to prune, it searches the grid cell by cell instead.
+    """
+    rectangles = decompose(maze)
+    heuristic = heuristic_func(maze.end_node)
+    start, goal = maze.start_node, maze.end_node
+    same_rect = rectangles.rect(start) == rectangles.rect(goal)
+    pruning = rectangles.interior_ratio >= MIN_INTERIOR_RATIO
+
+    # Perimeter cells directly in line with an interior goal lead straight to it
+    goal_entries = {}
+    if pruning and not rectangles.on_perimeter(goal):
+        goal_entries = {loc: cost for loc, cost in rectangles.projections(goal)}
+
+    def successors(active):
+        if not pruning:
+            return [(neighbor, 1) for neighbor in maze.get_neighbors(active)]
+
+        # An interior start first steps out to its rectangle's perimeter
+        if active == start and not rectangles.on_perimeter(start):
+            moves = rectangles.projections(start)
+        else:
+            moves = rectangles.successors(maze, active)
+
+        if active in goal_entries:
+            moves.append((goal, goal_entries[active]))
+        if active == start and same_rect:
+            moves.append((goal, abs(goal.x - start.x) + abs(goal.y - start.y)))
+        return moves
+
+    # Initialize a priority queue for A*
+    frontier = PriorityQueue()
+    frontier.push(DeepestMove(start, None, 0.0, heuristic(start)))
+
+    # Track visited nodes and their costs
+    visited_node = {start: 0.0}
+
+    # List to store all explored paths
+    all_paths = []
+
+    # Main RSR loop
+    while not frontier.empty:
+        loc = frontier.pop()
+        active = loc.current
+
+        # Skip entries superseded by a cheaper route, macro-edges make these common
+        if loc.cost > visited_node[active]:
+            continue
+        all_paths.append(active)
+
+        # Check if the end node is reached
+        if maze.end_node_line(active):
+            final_path = expand_path(reconstruct_path(loc) + [active])[1:-1]
+            if return_weights: return final_path, all_paths[1:-1], visited_node
+            return final_path, all_paths[1:-1]
+
+        # Explore perimeter successors and macro-edges
+        for neighbor, cost in successors(active):
+            new_cost = loc.cost + cost
+
+            # Update cost if a shorter path is found
+            if neighbor not in visited_node or visited_node[neighbor] > new_cost:
+                visited_node[neighbor] = new_cost
+                frontier.push(DeepestMove(neighbor, loc, new_cost, heuristic(neighbor)))
+
+    # Return None if no maze solution is found
+    if return_weights: return None, None, visited_node
+    return None, None
+
+
+# Starting heuristic inflation of anytime A* and how much each refinement lowers it
+INITIAL_EPSILON = 3.0
+EPSILON_STEP = 0.5
+
+
+# Anytime Repairing A* (ARA*)
+def anytime_a_star(maze, heuristic_func, epsilon=INITIAL_EPSILON, epsilon_step=EPSILON_STEP, deadline=None):
+    """
+    Weighted A* that finds a path quickly and then keeps improving it.
+
+    The first search inflates the heuristic by epsilon, so it reaches the end
+    after few expansions with a path at most epsilon times too long. Every
+    refinement lowers epsilon and reuses the costs found so far, expanding
+    again only the cells whose cost improved, until epsilon reaches 1 and
+    the path is optimal.
+
+    Args:
+        maze: Maze (or any graph with the same interface) to search
+        heuristic_func: admissible heuristic factory, e.g. manhattan_distance
+        epsilon: initial heuristic inflation, at least 1
+        epsilon_step: how much epsilon drops between refinements
+        deadline: time.perf_counter() value after which refinement stops, the
+            first path is always searched for
+
+    Yields:
+        (final_path, all_paths, cost, bound) for every improved path, where
+        all_paths holds the cells expanded by that refinement and bound is
+        the most the path cost can exceed the optimum by, as a factor
+    """
+    heuristic = heuristic_func(maze.end_node)
+    start, goal = maze.start_node, maze.end_node
+
+    # Best known cost and predecessor of every reached node
+    cost = {start: 0.0}
+    previous = {start: None}
+
+    # Open nodes wait in the frontier, improved nodes already expanded in this
+    # refinement are inconsistent and wait for the next one
+    open_nodes, closed, inconsistent = {start}, set(), set()
+    frontier = PriorityQueue()
+    frontier.push(DeepestMove(start, None, 0.0, epsilon * heuristic(start)))
+
+    best_path, best_cost = None, inf
+    while True:
+        all_paths = []
+
+        # Expand until no open node can lead to a cheaper end at this inflation
+        while not frontier.empty:
+            loc = frontier.peek()
+            active = loc.current
+            if active not in open_nodes or loc.cost > cost[active]:
+                frontier.pop()
+                continue
+            if min(cost.get(goal, inf), best_cost) <= loc.cost + loc.heuristic:
+                break
+
+            frontier.pop()
+            open_nodes.discard(active)
+            closed.add(active)
+            all_paths.append(active)
+
+            for neighbor in maze.get_neighbors(active):
+                new_cost = cost[active] + maze.step_cost(active, neighbor)
+                if neighbor not in cost or cost[neighbor] > new_cost:
+                    cost[neighbor] = new_cost
+                    previous[neighbor] = active
+                    if neighbor in closed:
+                        inconsistent.add(neighbor)
+                    else:
+                        open_nodes.add(neighbor)
+                        frontier.push(DeepestMove(neighbor, None, new_cost, epsilon * heuristic(neighbor)))
+
+            # Give up on the refinement, the previous path stands
+            if deadline is not None and best_path is not None and time.perf_counter() > deadline:
+                return
+
+        # Return if no maze solution is found
+        if goal not in cost:
+            return
+
+        # Predecessors may have improved since the end was reached, so the path
+        # they lead along can differ in cost from the end's recorded cost
+        path = [goal]
+        while previous[path[-1]] is not None:
+            path.append(previous[path[-1]])
+        path = path[::-1]
+        path_cost = sum(maze.step_cost(prev, curr) for prev, curr in zip(path, path[1:]))
+
+        improved = path_cost < best_cost
+        if improved:
+            best_path, best_cost = path[1:-1], path_cost
+
+        # No pending node can reach the end for less than its uninflated f-value
+        pending = open_nodes | inconsistent
+        lower = min((cost[loc] + heuristic(loc) for loc in pending), default=best_cost)
+        bound = max(1.0, min(epsilon, best_cost / lower)) if lower > 0 else 1.0
+
+        if improved or bound <= 1.0:
+            yield best_path, [loc for loc in all_paths if loc != start], best_cost, bound
+
+        if bound <= 1.0 or (deadline is not None and time.perf_counter() > deadline):
+            return
+
+        # Tighten the inflation and requeue every open and inconsistent node under it
+        epsilon = max(1.0, min(epsilon - epsilon_step, bound))
+        open_nodes, closed, inconsistent = pending, set(), set()
+        frontier = PriorityQueue()
+        for loc in open_nodes:
+            frontier.push(DeepestMove(loc, None, cost[loc], epsilon * heuristic(loc)))
+
+
+def anytime_search(maze, heuristic_func, epsilon=INITIAL_EPSILON, deadline=None, return_improvements=False):
+    """
+    Run anytime A* until the path is optimal or the deadline passes.
+
+    Returns:
+        The last path found and every cell expanded on the way (plus, when
+        return_improvements is set, a list with the cost, suboptimality bound
+        and elapsed ms of each improved path)
+    """
+    start_time = time.perf_counter()
+    final_path, all_paths, improvements = None, [], []
+    for final_path, expanded, cost, bound in anytime_a_star(maze, heuristic_func, epsilon, deadline=deadline):
+        all_paths.extend(expanded)
+        improvements.append({
+            "cost": cost,
+            "bound": round(bound, 4),
+            "timeTaken": round((time.perf_counter() - start_time) * 1000, 2)
+        })
+
+    if final_path is None:
+        all_paths = None
+    if return_improvements: return final_path, all_paths, improvements
+    return final_path, all_paths
+
+
+# Search engines available by name to the API and the command line tools
+algorithm_map = {
+    'astar': lambda maze: a_star(maze, manhattan_distance),
+    'bfs': lambda maze: breadth_first_search(maze),
+    'dfs': lambda maze: depth_first_search(maze),
+    'dijkstra': lambda maze: dijkstra(maze),
+    'greedy': lambda maze: greedy_best_first(maze, manhattan_distance),
+    'bidirectional': lambda maze: bidirectional_heuristic_search(maze, manhattan_distance),
+    'jps': lambda maze: jump_point_search(maze, manhattan_distance),
+    'rsr': lambda maze: rectangular_symmetry_reduction(maze, manhattan_distance),
+    'anytime': lambda maze: anytime_search(maze, manhattan_distance)
+}
+
+# Engines that read the grid directly and cannot search a reduced graph (see api/reduce.py)
+grid_engines = {'jps', 'rsr'}
+
+# Engines that count moves and ignore step costs, on a reduced graph whose
+# edges are corridors of different lengths their paths are not the shortest
+unit_step_engines = {'bfs', 'dfs'}
+
+# Engines meant to return a shortest path
+optimal_engines = {'astar', 'bfs', 'dijkstra', 'bidirectional', 'jps', 'rsr', 'anytime'}
@@ -1,48 +1,171 @@
+import json
 import time
-from flask import Blueprint, request, jsonify
+from math import isfinite
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from api.maze import Maze, Coordinate
-from api.algo import (
-    depth_first_search,
-    breadth_first_search,
-    a_star,
-    dijkstra,
-    greedy_best_first,
-    bidirectional_heuristic_search,
-    jump_point_search,
-    manhattan_distance
-)
+from api.frames import frame_budget, cell_budget, batch_frames
+from api.profiling import profiled, PhaseTimer
+from api.algo import breadth_first_search, algorithm_map, grid_engines, unit_step_engines
+from api.algo import anytime_a_star, anytime_search, manhattan_distance, INITIAL_EPSILON
+from api.reduce import reduce_maze
+from api.selector import board_features, select_engine
+from api.shared_cache import get_cache
+from api.maze_pool import MazePool, POPULAR_CONFIGS, POOL_SEEDS, WARM_POOL
+from api.generators import generate, generator_map, wall_rows
 
 # Create API blueprint
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
 
+def _anytime_options(epsilon, latency_ms):
+    """
+    Check the anytime A* options supplied by the client.
+
+    Returns:
+        (epsilon, latency_ms) with epsilon defaulted to INITIAL_EPSILON and
+        latency_ms None when not given
+
+    Raises:
+        ValueError: epsilon is not a number of at least 1, or latency_ms is
+            not a positive number
+    """
+    def number(value):
+        return not isinstance(value, bool) and isinstance(value, (int, float)) and isfinite(value)
+
+    if epsilon is None:
+        epsilon = INITIAL_EPSILON
+    if not number(epsilon) or epsilon < 1:
+        raise ValueError("epsilon must be a number of at least 1")
+    if latency_ms is not None and (not number(latency_ms) or latency_ms <= 0):
+        raise ValueError("latencyMs must be a positive number")
+    return float(epsilon), latency_ms
+
+
+def _cached_response(cache, key, payload, timer=None):
+    """
+    JSON response for payload, stored in the shared cache when it is enabled.
+
+    With a PhaseTimer, encoding the body is timed as the serialize phase and
+    every phase is reported in a Server-Timing header.
+    """
+    response = jsonify(payload)
+    if cache:
+        cache.put(key, response.get_data())
+        response.headers['X-Cache'] = 'miss'
+    if timer:
+        timer.lap('serialize')
+        response.headers['Server-Timing'] = timer.header()
+    return response
+
+
+def _stream_anytime(search_space, epsilon, deadline, expand=None):
+    """NDJSON lines, one per improved path, the last one marked final"""
+    # The route has already returned when this runs, so errors are reported
+    # as a final line instead of a 500
+    try:
+        start_time = time.perf_counter()
+        nodes_visited = 0
+        previous = None
+        for final_path, expanded, cost, bound in anytime_a_star(search_space, manhattan_distance, epsilon, deadline=deadline):
+            nodes_visited += len(expanded)
+            if expand:
+                final_path = expand(final_path)
+            line = {
+                "success": True,
+                "path": [[coord.x, coord.y] for coord in final_path],
+                "final": False,
+                "stats": {
+                    "nodesVisited": nodes_visited,
+                    "pathLength": len(final_path),
+                    "cost": cost,
+                    "bound": round(bound, 4),
+                    "timeTaken": round((time.perf_counter() - start_time) * 1000, 2)
+                }
+            }
+            # Hold each line back by one so the last can be marked final
+            if previous:
+                yield json.dumps(previous) + '\n'
+            previous = line
+
+        if previous is None:
+            yield json.dumps({"success": False, "error": "No path found between start and end points", "final": True}) + '\n'
+        else:
+            previous["final"] = True
+            yield json.dumps(previous) + '\n'
+
+    except Exception as e:
+        yield json.dumps({"success": False, "error": f"Internal server error: {str(e)}", "final": True}) + '\n'
+
+
 @api_bp.route('/solve', methods=['POST'])
+@profiled
 def solve_maze():
     """
     Execute a pathfinding algorithm on a given maze state.
 
+    Send an "X-Profile: 1" header to capture a profile of the request when
+    PATHVIZ_PROFILE_DIR is set (see api/profiling.py). When PATHVIZ_CACHE_PATH
+    is set, responses are shared between workers through api/shared_cache.py
+    and the X-Cache header tells whether the request was a hit or a miss. The
+    Server-Timing header splits the request into its parse, select (auto
+    only), cache, reduce, search and serialize phases.
+
     Expected JSON payload:
     {
-        "algorithm": str,  # "astar", "bfs", "dfs", "dijkstra", "greedy", "bidirectional", "jps"
+        "algorithm": str,  # "astar", "bfs", "dfs", "dijkstra", "greedy", "bidirectional", "jps", "rsr", "anytime", "auto"
         "grid": [[bool]],  # 2D array where true = wall, false = empty
         "start": [int, int],  # [row, col]
-        "end": [int, int]  # [row, col]
+        "end": [int, int],  # [row, col]
+
+        # Optional frame budget, replaces "visited" with "frames" in the response
+        "maxFrames": int,  # number of animation frames
+        "fps": float,  # or frames per second ...
+        "duration": float,  # ... times playback duration in seconds
+        "maxCells": int,  # cap on visited cells shipped across all frames
+
+        "reduce": bool,  # prune dead ends and collapse corridors before searching
+
+        "guarantee": str,  # "auto" only: "optimal" (default) or "any" path
+
+        # Anytime A* ("anytime") only
+        "epsilon": float,  # initial heuristic inflation, >= 1 (default 3)
+        "latencyMs": float,  # stop refining after this long and return the best path so far
+        "stream": bool  # send every improved path as a line of NDJSON as it is found
     }
 
     Returns:
     {
         "success": bool,
-        "visited": [[int, int]],  # List of visited coordinates
+        "visited": [[int, int]],  # List of visited coordinates (no frame budget)
+        "frames": [[[int, int]]],  # Visited coordinates grouped per frame (frame budget)
         "path": [[int, int]],  # Final path coordinates
         "stats": {
             "nodesVisited": int,
             "pathLength": int,
-            "timeTaken": float  # milliseconds
+            "timeTaken": float,  # milliseconds
+            "bound": float,  # Only for anytime: path cost is at most bound times the optimum
+            "improvements": [{"cost": int, "bound": float, "timeTaken": float}],  # Only for anytime
+            "reduction": {  # Only if reduce = true
+                "cells": int,  # open cells on the board
+                "prunedDeadEnds": int,
+                "nodes": int,  # nodes left in the reduced graph
+                "edges": int,
+                "cached": bool
+            }
+        },
+        "selection": {  # Only for auto
+            "engine": str,  # engine that ran
+            "guarantee": str,
+            "features": {"rows": int, "cols": int, "density": float, "corridorRatio": float, "deadEndRatio": float, "distance": float},
+            "predicted": {str: float},  # predicted milliseconds per candidate
+            "reason": str
         },
         "error": str  # Only if success = false
     }
     """
     try:
+        # Time parsing, search and serialization separately for Server-Timing
+        timer = PhaseTimer()
         data = request.get_json()
 
         # Validate request
@@ -57,21 +180,32 @@ def solve_maze():
         if not grid_state:
             return jsonify({"success": False, "error": "Grid state not provided"}), 400
 
+        try:
+            max_frames = frame_budget(data.get('maxFrames'), data.get('fps'), data.get('duration'))
+            max_cells = cell_budget(data.get('maxCells'))
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        reduce = data.get('reduce', False)
+
         # Create maze from grid state
         maze = Maze.from_grid_state(grid_state, start, end)
+        timer.lap('parse')
 
         # Select and execute algorithm
         start_time = time.time()
 
-        algorithm_map = {
-            'astar': lambda: a_star(maze, manhattan_distance),
-            'bfs': lambda: breadth_first_search(maze),
-            'dfs': lambda: depth_first_search(maze),
-            'dijkstra': lambda: dijkstra(maze),
-            'greedy': lambda: greedy_best_first(maze, manhattan_distance),
-            'bidirectional': lambda: bidirectional_heuristic_search(maze, manhattan_distance),
-            'jps': lambda: jump_point_search(maze, manhattan_distance)
-        }
+        # Let the cost model pick the engine, the board features take one pass over the grid
+        selection = None
+        requested = algorithm
+        if algorithm == 'auto':
+            guarantee = data.get('guarantee', 'optimal')
+            if guarantee not in ('optimal', 'any'):
+                return jsonify({"success": False, "error": f"Unknown guarantee: {guarantee}"}), 400
+
+            exclude = grid_engines | unit_step_engines if reduce else set()
+            selection = select_engine(board_features(grid_state, start, end), guarantee, exclude)
+            algorithm = selection["engine"]
+            timer.lap('select')
 
         if algorithm not in algorithm_map:
             return jsonify({
@@ -79,38 +213,114 @@ def solve_maze():
                 "error": f"Unknown algorithm: {algorithm}"
             }), 400
 
+        # Grid engines cannot search a reduced graph, and BFS and DFS would count
+        # corridor edges there rather than cells
+        if reduce and algorithm in grid_engines | unit_step_engines:
+            return jsonify({
+                "success": False,
+                "error": f"Algorithm {algorithm} does not support reduce"
+            }), 400
+
+        # Only anytime A* reads epsilon and latencyMs, other engines ignore them
+        epsilon, latency_ms, deadline = None, None, None
+        stream = data.get('stream', False)
+        if algorithm == 'anytime':
+            try:
+                epsilon, latency_ms = _anytime_options(data.get('epsilon'), data.get('latencyMs'))
+            except ValueError as e:
+                return jsonify({"success": False, "error": str(e)}), 400
+            if latency_ms is not None:
+                deadline = time.perf_counter() + latency_ms / 1000
+
+        # Serve repeated boards from the cache shared by every worker, answers
+        # cut short by a latency target depend on timing and are not shared
+        timed = algorithm == 'anytime' and (latency_ms is not None or stream)
+        cache = get_cache() if not timed else None
+        cache_key = None
+        if cache:
+            cache_key = json.dumps([
+                "solve", maze.wall_hash(), requested, data.get('guarantee'), start, end,
+                reduce, max_frames, max_cells, epsilon
+            ])
+            body = cache.get(cache_key)
+            timer.lap('cache')
+            if body is not None:
+                return Response(body, mimetype='application/json', headers={
+                    'X-Cache': 'hit',
+                    'Server-Timing': timer.header()
+                }), 200
+
+        # Search the reduced graph instead of the grid when requested
+        search_space, reduction = maze, None
+        if reduce:
+            search_space, cached = reduce_maze(maze)
+            reduction = {**search_space.stats, "cached": cached}
+            timer.lap('reduce')
+
+        if algorithm == 'anytime' and stream:
+            expand = search_space.expand_path if reduce else None
+            return Response(
+                stream_with_context(_stream_anytime(search_space, epsilon, deadline, expand)),
+                mimetype='application/x-ndjson'
+            )
+
         # Execute algorithm
-        final_path, visited_path = algorithm_map[algorithm]()
+        improvements = None
+        if algorithm == 'anytime':
+            final_path, visited_path, improvements = anytime_search(
+                search_space, manhattan_distance, epsilon, deadline, return_improvements=True
+            )
+        else:
+            final_path, visited_path = algorithm_map[algorithm](search_space)
+        if reduce:
+            final_path = search_space.expand_path(final_path)
 
         end_time = time.time()
         time_taken = (end_time - start_time) * 1000  # Convert to milliseconds
+        timer.lap('search')
 
         # Check if path was found
         if final_path is None:
-            return jsonify({
+            stats = {
+                "nodesVisited": len(visited_path) if visited_path else 0,
+                "pathLength": 0,
+                "timeTaken": round(time_taken, 2)
+            }
+            if reduction: stats["reduction"] = reduction
+            response = {
                 "success": False,
                 "error": "No path found between start and end points",
-                "stats": {
-                    "nodesVisited": len(visited_path) if visited_path else 0,
-                    "pathLength": 0,
-                    "timeTaken": round(time_taken, 2)
-                }
-            }), 200
+                "stats": stats
+            }
+            if selection: response["selection"] = selection
+            return _cached_response(cache, cache_key, response, timer), 200
 
         # Convert Coordinate objects to [row, col] lists
-        visited_coords = [[coord.x, coord.y] for coord in visited_path] if visited_path else []
         path_coords = [[coord.x, coord.y] for coord in final_path] if final_path else []
+        visited_path = visited_path or []
 
-        return jsonify({
+        response = {
             "success": True,
-            "visited": visited_coords,
             "path": path_coords,
             "stats": {
-                "nodesVisited": len(visited_coords),
+                "nodesVisited": len(visited_path),
                 "pathLength": len(path_coords),
                 "timeTaken": round(time_taken, 2)
             }
-        }), 200
+        }
+        if reduction: response["stats"]["reduction"] = reduction
+        if improvements:
+            response["stats"]["bound"] = improvements[-1]["bound"]
+            response["stats"]["improvements"] = improvements
+        if selection: response["selection"] = selection
+
+        # Group the trace into a bounded number of frames when the client asks for it
+        if max_frames is not None:
+            response["frames"] = batch_frames(visited_path, max_frames, max_cells)
+        else:
+            response["visited"] = [[coord.x, coord.y] for coord in visited_path]
+
+        return _cached_response(cache, cache_key, response, timer), 200
 
     except Exception as e:
         return jsonify({
@@ -169,18 +379,110 @@ def validate_maze():
         }), 500
 
 
-@api_bp.route('/maze/generate', methods=['POST'])
+def _generate_payload(rows, cols, density, style, seed=None, braid=0.0):
+    """
+    Build a generated maze as a response payload.
+
+    With a seed the result is a pure function of the arguments, the random
+    style derives one seed per verification attempt from it.
+    """
+    # Structured mazes are solvable by construction, no verification search needed
+    if style in generator_map:
+        walls, start, end = generate(style, rows, cols, seed, braid)
+        return {
+            "grid": wall_rows(walls, rows, cols),
+            "start": list(start),
+            "end": list(end)
+        }
+
+    if style != 'random':
+        raise ValueError(f"Unknown maze style: {style}")
+
+    def attempt_seed(attempt):
+        return None if seed is None else f"{seed}:{attempt}"
+
+    # Create maze with random obstacles
+    maze = Maze(
+        rows=rows,
+        columns=cols,
+        barriers=density,
+        random_obstacles=True,
+        seed=attempt_seed(0)
+    )
+
+    # Ensure maze has a solution, regenerate if needed
+    max_attempts = 10
+    attempts = 0
+
+    while attempts < max_attempts:
+        final_path, _ = breadth_first_search(maze)
+        if final_path is not None:
+            break
+
+        # Regenerate maze
+        attempts += 1
+        maze = Maze(
+            rows=rows,
+            columns=cols,
+            barriers=density,
+            random_obstacles=True,
+            seed=attempt_seed(attempts)
+        )
+
+    # Convert maze to grid format
+    grid = []
+    for row in maze.maze:
+        grid_row = []
+        for cell in row:
+            grid_row.append(cell == 'X')  # True if wall
+        grid.append(grid_row)
+
+    return {
+        "grid": grid,
+        "start": [maze.start_node.x, maze.start_node.y],
+        "end": [maze.end_node.x, maze.end_node.y]
+    }
+
+
+# Pre-encoded responses for seeded generate requests
+maze_pool = MazePool()
+
+
+def _warm_pool():
+    """Encode the POPULAR_CONFIGS seeds before the first request asks for them"""
+    for rows, cols, density, style in POPULAR_CONFIGS:
+        for seed in range(POOL_SEEDS):
+            maze_pool.get(
+                (rows, cols, density, style, seed, 0.0),
+                lambda: _generate_payload(rows, cols, density, style, seed)
+            )
+
+
+# Opt-in, so workers and command line tools that import this module do not
+# each pay for building the pool
+if WARM_POOL:
+    _warm_pool()
+
+
+@api_bp.route('/maze/generate', methods=['GET', 'POST'])
 def generate_maze():
     """
     Generate a random maze.
 
-    Expected JSON payload:
+    Expected JSON payload (POST) or query parameters (GET):
     {
         "rows": int,
         "cols": int,
-        "density": float  # 0.0 to 1.0, percentage of walls
+        "density": float,  # 0.0 to 1.0, percentage of walls ("random" style only)
+        "style": str,  # "random" (default), "backtracker", "kruskal", "prim"
+        "braid": float,  # 0.0 to 1.0, fraction of dead ends opened into loops (structured styles)
+        "seed": int  # makes the maze a pure function of the parameters
     }
 
+    Seeded responses carry a strong ETag, answer If-None-Match with 304, are
+    gzipped for clients that accept it and are served from a pool of
+    pre-encoded bodies. Use GET so browsers and proxies can revalidate them.
+
     Returns:
     {
         "grid": [[bool]],  # 2D array where true = wall
@@ -189,53 +491,76 @@ def generate_maze():
     }
     """
     try:
-        data = request.get_json()
-
-        rows = data.get('rows', 30)
-        cols = data.get('cols', 30)
-        density = data.get('density', 0.3)
-
-        # Create maze with random obstacles
-        maze = Maze(
-            rows=rows,
-            columns=cols,
-            barriers=density,
-            random_obstacles=True
+        data = request.get_json() if request.method == 'POST' else request.args
+
+        try:
+            rows = int(data.get('rows', 30))
+            cols = int(data.get('cols', 30))
+            density = float(data.get('density', 0.3))
+            braid = float(data.get('braid', 0.0))
+            seed = data.get('seed')
+            if seed is not None:
+                seed = int(seed)
+        except (TypeError, ValueError):
+            return jsonify({"error": "rows, cols and seed must be integers, density and braid numbers"}), 400
+        style = data.get('style', 'random')
+
+        if style != 'random' and style not in generator_map:
+            return jsonify({"error": f"Unknown maze style: {style}"}), 400
+
+        # Unseeded mazes differ on every call and cannot be cached
+        if seed is None:
+            response = jsonify(_generate_payload(rows, cols, density, style, braid=braid))
+            response.headers['Cache-Control'] = 'no-store'
+            return response, 200
+
+        entry = maze_pool.get(
+            (rows, cols, density, style, seed, braid),
+            lambda: _generate_payload(rows, cols, density, style, seed, braid)
         )
 
-        # Ensure maze has a solution, regenerate if needed
-        max_attempts = 10
-        attempts = 0
-
-        while attempts < max_attempts:
-            final_path, _ = breadth_first_search(maze)
-            if final_path is not None:
-                break
-
-            # Regenerate maze
-            maze = Maze(
-                rows=rows,
-                columns=cols,
-                barriers=density,
-                random_obstacles=True
-            )
-            attempts += 1
+        gzipped = 'gzip' in request.accept_encodings
+        etag = f"{entry.etag}-gzip" if gzipped else entry.etag
 
-        # Convert maze to grid format
-        grid = []
-        for row in maze.maze:
-            grid_row = []
-            for cell in row:
-                grid_row.append(cell == 'X')  # True if wall
-            grid.append(grid_row)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(entry.gzipped if gzipped else entry.body, mimetype='application/json')
+            if gzipped:
+                response.headers['Content-Encoding'] = 'gzip'
 
-        return jsonify({
-            "grid": grid,
-            "start": [maze.start_node.x, maze.start_node.y],
-            "end": [maze.end_node.x, maze.end_node.y]
-        }), 200
+        # The same seed may produce a different maze after a generator change,
+        # so caches revalidate every time and the ETag turns that into a 304
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
 
     except Exception as e:
         return jsonify({
             "error": f"Error generating maze: {str(e)}"
         }), 500
+
+
+@api_bp.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """
+    Report the shared solve cache's counters, summed over every worker.
+
+    Returns:
+    {
+        "enabled": bool,
+        "hits": int,
+        "misses": int,
+        "hitRate": float,
+        "stores": int,
+        "evictions": int,
+        "entries": int,
+        "capacity": int,
+        "slotSize": int  # bytes, larger responses are not cached
+    }
+    """
+    cache = get_cache()
+    if not cache:
+        return jsonify({"enabled": False}), 200
+    return jsonify({"enabled": True, **cache.stats()}), 200
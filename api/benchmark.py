@@ -0,0 +1,335 @@
+import os
+import sys
+import json
+import time
+import random
+import pstats
+import cProfile
+import argparse
+from statistics import median
+
+from api.maze import Maze, MazeSymbol
+from api.algo import algorithm_map
+from api.generators import generate, generator_map, wall_rows
+from api.selector import board_features, fit_cost_model, load_cost_model, select_engine, CANDIDATES, COST_MODEL_PATH
+
+
+def _int_list(value):
+    return [int(item) for item in value.split(',')]
+
+
+def _float_list(value):
+    return [float(item) for item in value.split(',')]
+
+
+def bench_solve(sizes, densities, algorithms, boards=5, seed=0):
+    """
+    Time each algorithm on random square boards.
+
+    Returns:
+        List of result dicts, one per (size, density, algorithm)
+    """
+    results = []
+    for size in sizes:
+        for density in densities:
+            random.seed(seed)
+            mazes = [Maze(rows=size, columns=size, barriers=density, random_obstacles=True) for _ in range(boards)]
+
+            for algorithm in algorithms:
+                times, expansions, solved = [], [], 0
+                for maze in mazes:
+                    start_time = time.perf_counter()
+                    final_path, visited_path = algorithm_map[algorithm](maze)
+                    times.append((time.perf_counter() - start_time) * 1000)
+                    expansions.append(len(visited_path) if visited_path else 0)
+                    solved += final_path is not None
+
+                results.append({
+                    "size": size,
+                    "density": density,
+                    "algorithm": algorithm,
+                    "boards": boards,
+                    "solved": solved,
+                    "medianTime": round(median(times), 3),
+                    "medianExpansions": median(expansions)
+                })
+
+    return results
+
+
+def bench_generate(sizes, styles, repeat=3, seed=0):
+    """
+    Measure maze generator throughput on square boards.
+
+    Returns:
+        List of result dicts, one per (size, style)
+    """
+    results = []
+    for size in sizes:
+        for style in styles:
+            times = []
+            for i in range(repeat):
+                start_time = time.perf_counter()
+                generate(style, size, size, seed + i)
+                times.append(time.perf_counter() - start_time)
+
+            results.append({
+                "size": size,
+                "style": style,
+                "medianTime": round(median(times) * 1000, 3),
+                "cellsPerSecond": round(size * size / median(times))
+            })
+
+    return results
+
+
+# Share of calibration boards searched between the default corners the
+# front-end and generators use, the rest get endpoints anywhere on the board
+DEFAULT_PLACEMENT_SHARE = 0.75
+
+
+def _calibration_board(rng, size, style):
+    """
+    A solvable board of the given style with the endpoints clients send.
+
+    Most boards keep the default corner to corner placement, (0, 0) to
+    (size - 1, size - 1) for random boards and the generator's corners for
+    the other styles, the rest have endpoints anywhere on the board.
+    """
+    while True:
+        if style == 'random':
+            maze = Maze(rows=size, columns=size, barriers=rng.uniform(0.0, 0.4), random_obstacles=True, seed=rng.random())
+            walls = [[cell == MazeSymbol.wall for cell in row] for row in maze.maze]
+            start, end = maze.start_node, maze.end_node
+        else:
+            flat, start, end = generate(style, size, size, rng.random(), rng.choice([0.0, 0.2, 0.6]))
+            walls = wall_rows(flat, size, size)
+
+        if rng.random() >= DEFAULT_PLACEMENT_SHARE:
+            free = [(r, c) for r in range(size) for c in range(size) if not walls[r][c]]
+            start, end = rng.sample(free, 2)
+        start, end = tuple(start), tuple(end)
+
+        maze = Maze.from_walls(walls, start, end)
+        if algorithm_map['bfs'](maze)[0] is not None:
+            return walls, start, end, maze
+
+
+def calibrate(sizes, styles, boards=10, seed=0, repeat=3):
+    """
+    Time the auto mode candidates on varied boards and fit the cost model.
+
+    Returns:
+        Cost model dict, ready to be written to api/cost_model.json
+    """
+    rng = random.Random(seed)
+    engines = sorted({name for names in CANDIDATES.values() for name in names})
+
+    samples = []
+    for size in sizes:
+        for style in styles:
+            for _ in range(boards):
+                walls, start, end, maze = _calibration_board(rng, size, style)
+                features = board_features(walls, start, end)
+                for engine in engines:
+                    times = []
+                    for _ in range(repeat):
+                        start_time = time.perf_counter()
+                        algorithm_map[engine](maze)
+                        times.append((time.perf_counter() - start_time) * 1000)
+                    samples.append((features, engine, min(times)))
+
+    model = fit_cost_model(samples)
+    model["calibration"] = {"sizes": sizes, "styles": styles, "boards": boards, "seed": seed}
+    return model
+
+
+def bench_auto(sizes, styles, boards=5, seed=1, repeat=3, model_path=COST_MODEL_PATH):
+    """
+    Compare algorithm "auto" against always running A* on the boards clients
+    send most, square boards searched between their default corners.
+
+    Auto's time includes computing the board statistics and picking the
+    engine. Use it to check a refitted cost model before shipping it.
+
+    Returns:
+        List of result dicts, one per (size, style), and a total row
+    """
+    model = load_cost_model(model_path)
+    rng = random.Random(seed)
+
+    results = []
+    for size in sizes:
+        for style in styles:
+            astar_time, auto_time, picks = 0.0, 0.0, {}
+            for _ in range(boards):
+                if style == 'random':
+                    maze = Maze(rows=size, columns=size, barriers=rng.uniform(0.0, 0.4), random_obstacles=True, seed=rng.random())
+                    walls = [[cell == MazeSymbol.wall for cell in row] for row in maze.maze]
+                else:
+                    flat, start, end = generate(style, size, size, rng.random(), rng.choice([0.0, 0.2, 0.6]))
+                    walls = wall_rows(flat, size, size)
+                    maze = Maze.from_walls(walls, start, end)
+                start, end = tuple(maze.start_node), tuple(maze.end_node)
+
+                def run_auto():
+                    engine = select_engine(board_features(walls, start, end), model=model)["engine"]
+                    algorithm_map[engine](maze)
+                    return engine
+
+                astar_runs, auto_runs = [], []
+                for _ in range(repeat):
+                    # Alternate the two so drift on the machine hits both alike
+                    start_time = time.perf_counter()
+                    algorithm_map['astar'](maze)
+                    astar_runs.append((time.perf_counter() - start_time) * 1000)
+                    start_time = time.perf_counter()
+                    engine = run_auto()
+                    auto_runs.append((time.perf_counter() - start_time) * 1000)
+
+                astar_time += min(astar_runs)
+                auto_time += min(auto_runs)
+                picks[engine] = picks.get(engine, 0) + 1
+
+            results.append({
+                "size": size,
+                "style": style,
+                "boards": boards,
+                "astarTime": round(astar_time, 3),
+                "autoTime": round(auto_time, 3),
+                "picks": picks
+            })
+
+    astar_total = sum(result["astarTime"] for result in results)
+    auto_total = sum(result["autoTime"] for result in results)
+    results.append({
+        "astarTime": round(astar_total, 3),
+        "autoTime": round(auto_total, 3),
+        "ratio": round(auto_total / astar_total, 4) if astar_total else None
+    })
+    return results
+
+
+def _capture_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.endswith('.json')
+            )
+        else:
+            yield path
+
+
+def replay(paths, repeat=5, profile=False):
+    """
+    Replay requests captured by api.profiling against a local app instance.
+
+    Returns:
+        List of result dicts, one per capture
+    """
+    from api.app import app
+    client = app.test_client()
+
+    results = []
+    for path in _capture_files(paths):
+        with open(path) as f:
+            capture = json.load(f)
+
+        times = []
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            response = client.post(capture["path"], json=capture["payload"])
+            times.append((time.perf_counter() - start_time) * 1000)
+
+        results.append({
+            "capture": path,
+            "path": capture["path"],
+            "status": response.status_code,
+            "capturedTime": capture.get("timeTaken"),
+            "minTime": round(min(times), 3),
+            "medianTime": round(median(times), 3)
+        })
+
+        if profile:
+            profiler = cProfile.Profile()
+            profiler.runcall(client.post, capture["path"], json=capture["payload"])
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(20)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Path Visualizer benchmarks")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    solve = commands.add_parser('solve', help="time the algorithms on random boards")
+    solve.add_argument('--sizes', type=_int_list, default=[30, 100, 300])
+    solve.add_argument('--densities', type=_float_list, default=[0.1, 0.3])
+    solve.add_argument('--algorithms', default=','.join(algorithm_map))
+    solve.add_argument('--boards', type=int, default=5)
+    solve.add_argument('--seed', type=int, default=0)
+
+    gen = commands.add_parser('generate', help="measure maze generator throughput")
+    gen.add_argument('--sizes', type=_int_list, default=[100, 500, 2000])
+    gen.add_argument('--styles', default=','.join(generator_map))
+    gen.add_argument('--repeat', type=int, default=3)
+    gen.add_argument('--seed', type=int, default=0)
+
+    replay_cmd = commands.add_parser('replay', help="replay profiling captures offline")
+    replay_cmd.add_argument('captures', nargs='+', help="capture .json files or directories of them")
+    replay_cmd.add_argument('--repeat', type=int, default=5)
+    replay_cmd.add_argument('--profile', action='store_true', help="print the top of a fresh profile to stderr")
+
+    auto_cmd = commands.add_parser('auto', help="compare algorithm \"auto\" with always running A*")
+    auto_cmd.add_argument('--sizes', type=_int_list, default=[20, 60, 100, 200])
+    auto_cmd.add_argument('--styles', default=','.join(['random'] + list(generator_map)))
+    auto_cmd.add_argument('--boards', type=int, default=5, help="boards per size and style")
+    auto_cmd.add_argument('--repeat', type=int, default=3)
+    auto_cmd.add_argument('--seed', type=int, default=1)
+    auto_cmd.add_argument('--model', default=COST_MODEL_PATH, help="cost model to check")
+
+    calibrate_cmd = commands.add_parser('calibrate', help="fit the cost model used by algorithm \"auto\"")
+    calibrate_cmd.add_argument('--sizes', type=_int_list, default=[15, 30, 60, 120, 200])
+    calibrate_cmd.add_argument('--styles', default=','.join(['random'] + list(generator_map)))
+    calibrate_cmd.add_argument('--boards', type=int, default=8, help="boards per size and style")
+    calibrate_cmd.add_argument('--repeat', type=int, default=3)
+    calibrate_cmd.add_argument('--seed', type=int, default=0)
+    calibrate_cmd.add_argument('--out', default=COST_MODEL_PATH)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'solve':
+        algorithms = args.algorithms.split(',')
+        unknown = [name for name in algorithms if name not in algorithm_map]
+        if unknown:
+            parser.error(f"Unknown algorithm: {', '.join(unknown)}")
+        results = bench_solve(args.sizes, args.densities, algorithms, args.boards, args.seed)
+    elif args.command == 'generate':
+        styles = args.styles.split(',')
+        unknown = [name for name in styles if name not in generator_map]
+        if unknown:
+            parser.error(f"Unknown maze style: {', '.join(unknown)}")
+        results = bench_generate(args.sizes, styles, args.repeat, args.seed)
+    elif args.command == 'auto':
+        styles = args.styles.split(',')
+        unknown = [name for name in styles if name != 'random' and name not in generator_map]
+        if unknown:
+            parser.error(f"Unknown maze style: {', '.join(unknown)}")
+        results = bench_auto(args.sizes, styles, args.boards, args.seed, args.repeat, args.model)
+    elif args.command == 'calibrate':
+        styles = args.styles.split(',')
+        unknown = [name for name in styles if name != 'random' and name not in generator_map]
+        if unknown:
+            parser.error(f"Unknown maze style: {', '.join(unknown)}")
+        results = calibrate(args.sizes, styles, args.boards, args.seed, args.repeat)
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+    else:
+        results = replay(args.captures, args.repeat, args.profile)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from api.maze import Maze, MazeSymbol
+from api.algo import algorithm_map
+from api.generators import generate, generator_map
+
+MANIFEST = 'manifest.json'
+FORMAT_VERSION = 1
+
+
+def _int_pair(value):
+    rows, cols = value.lower().split('x')
+    return int(rows), int(cols)
+
+
+def shard_name(index):
+    return f"shard-{index:05d}.npz"
+
+
+def build_board(config, board):
+    """
+    Generate one board of the dataset.
+
+    Every board has its own seed derived from the dataset seed and its index,
+    so a board is the same whichever worker or run produces it.
+
+    Returns:
+        (walls, maze) where walls is a 2D numpy bool array
+    """
+    rows, cols = config['rows'], config['cols']
+    seed = f"{config['seed']}:{board}"
+
+    if config['style'] in generator_map:
+        flat, start, end = generate(config['style'], rows, cols, seed, config['braid'])
+        walls = np.frombuffer(bytes(flat), dtype=np.uint8).reshape(rows, cols).astype(bool)
+        return walls, Maze.from_walls(walls, start, end)
+
+    maze = Maze(rows=rows, columns=cols, barriers=config['density'], random_obstacles=True, seed=seed)
+    walls = np.array([[cell == MazeSymbol.wall for cell in row] for row in maze.maze], dtype=bool)
+    return walls, maze
+
+
+def _ragged(sequences):
+    """Concatenate lists of cells into one (n, 2) array plus row offsets"""
+    offsets = np.zeros(len(sequences) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(cells) for cells in sequences])
+    cells = np.array([cell for cells in sequences for cell in cells], dtype=np.int32).reshape(-1, 2)
+    return cells, offsets
+
+
+def write_shard(task):
+    """
+    Generate, solve and write one shard of boards.
+
+    The shard is written to a temporary file and renamed into place, so a
+    shard file on disk is always complete and an interrupted run resumes
+    by redoing only the shards that are missing.
+
+    Returns:
+        Manifest entry for the shard
+    """
+    out_dir, index, first, count, config = task
+    start_time = time.perf_counter()
+
+    arrays = {
+        'walls': np.zeros((count, config['rows'], config['cols']), dtype=bool),
+        'starts': np.zeros((count, 2), dtype=np.int32),
+        'ends': np.zeros((count, 2), dtype=np.int32),
+        'board': np.arange(first, first + count, dtype=np.int64)
+    }
+    paths = {algorithm: [] for algorithm in config['algorithms']}
+    traces = {algorithm: [] for algorithm in config['algorithms']}
+    times = {algorithm: np.zeros(count, dtype=np.float32) for algorithm in config['algorithms']}
+    solved = {algorithm: 0 for algorithm in config['algorithms']}
+
+    for i in range(count):
+        walls, maze = build_board(config, first + i)
+        arrays['walls'][i] = walls
+        arrays['starts'][i] = maze.start_node
+        arrays['ends'][i] = maze.end_node
+
+        for algorithm in config['algorithms']:
+            solve_start = time.perf_counter()
+            final_path, visited = algorithm_map[algorithm](maze)
+            times[algorithm][i] = (time.perf_counter() - solve_start) * 1000
+
+            # Stored paths include both endpoints, an unsolved board has an empty path
+            if final_path is None:
+                paths[algorithm].append([])
+            else:
+                solved[algorithm] += 1
+                path = [maze.start_node] + list(final_path) + [maze.end_node]
+                paths[algorithm].append(path if maze.start_node != maze.end_node else [maze.start_node])
+            traces[algorithm].append(visited or [])
+
+    for algorithm in config['algorithms']:
+        arrays[f'{algorithm}_path'], arrays[f'{algorithm}_path_offsets'] = _ragged(paths[algorithm])
+        arrays[f'{algorithm}_expansions'] = np.array([len(t) for t in traces[algorithm]], dtype=np.int32)
+        arrays[f'{algorithm}_time'] = times[algorithm]
+        if config['traces']:
+            arrays[f'{algorithm}_trace'], arrays[f'{algorithm}_trace_offsets'] = _ragged(traces[algorithm])
+
+    name = shard_name(index)
+    tmp_path = os.path.join(out_dir, name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp_path, os.path.join(out_dir, name))
+
+    return {
+        "index": index,
+        "file": name,
+        "first": first,
+        "boards": count,
+        "solved": solved,
+        "bytes": os.path.getsize(os.path.join(out_dir, name)),
+        "timeTaken": round((time.perf_counter() - start_time) * 1000, 3)
+    }
+
+
+def load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(out_dir, manifest):
+    """Write the manifest atomically so it never describes a half-written state"""
+    path = os.path.join(out_dir, MANIFEST)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(path + '.tmp', path)
+
+
+def export_dataset(out_dir, config, workers=None, progress=None):
+    """
+    Generate and solve config['boards'] boards into compressed shards.
+
+    Shards are built independently in a process pool, each worker holding
+    only the shard it is writing, and the manifest is updated as each one
+    lands. Running again with the same configuration skips the shards the
+    manifest already lists.
+
+    Args:
+        out_dir: directory for the shards and manifest.json
+        config: dict with boards, shardSize, rows, cols, density, style, braid,
+            seed, algorithms and traces
+        workers: number of processes, defaults to the CPU count
+        progress: optional callable given each new manifest shard entry
+
+    Returns:
+        The final manifest
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    manifest = load_manifest(out_dir)
+    if manifest is None:
+        manifest = {"version": FORMAT_VERSION, "config": config, "shards": []}
+    elif manifest["config"] != config:
+        raise ValueError(f"{out_dir} holds a dataset with a different configuration")
+
+    done = {
+        shard["index"] for shard in manifest["shards"]
+        if os.path.exists(os.path.join(out_dir, shard["file"]))
+    }
+    manifest["shards"] = [shard for shard in manifest["shards"] if shard["index"] in done]
+
+    shard_size = config['shardSize']
+    tasks = [
+        (out_dir, index, first, min(shard_size, config['boards'] - first), config)
+        for index, first in enumerate(range(0, config['boards'], shard_size))
+        if index not in done
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(write_shard, task) for task in tasks]
+        for future in as_completed(futures):
+            shard = future.result()
+            manifest["shards"].append(shard)
+            manifest["shards"].sort(key=lambda entry: entry["index"])
+            save_manifest(out_dir, manifest)
+            if progress:
+                progress(shard)
+
+    save_manifest(out_dir, manifest)
+    return manifest
+
+
+def load_shard(path):
+    """
+    Read a shard back as a list of boards.
+
+    Returns:
+        List of dicts with walls, start, end and per-algorithm path (and trace
+        when the dataset was exported with traces)
+    """
+    with np.load(path) as data:
+        algorithms = [key[:-len('_path_offsets')] for key in data.files if key.endswith('_path_offsets')]
+        arrays = {key: data[key] for key in data.files}
+
+    boards = []
+    for i in range(len(arrays['walls'])):
+        board = {
+            "walls": arrays['walls'][i],
+            "start": tuple(arrays['starts'][i].tolist()),
+            "end": tuple(arrays['ends'][i].tolist()),
+            "board": int(arrays['board'][i])
+        }
+        for algorithm in algorithms:
+            offsets = arrays[f'{algorithm}_path_offsets']
+            board[f'{algorithm}_path'] = arrays[f'{algorithm}_path'][offsets[i]:offsets[i + 1]]
+            if f'{algorithm}_trace' in arrays:
+                offsets = arrays[f'{algorithm}_trace_offsets']
+                board[f'{algorithm}_trace'] = arrays[f'{algorithm}_trace'][offsets[i]:offsets[i + 1]]
+        boards.append(board)
+    return boards
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export solved mazes as a sharded .npz dataset")
+    parser.add_argument('out', help="output directory, rerun with the same arguments to resume")
+    parser.add_argument('--boards', type=int, default=10000)
+    parser.add_argument('--shard-size', type=int, default=1000, help="boards per shard file")
+    parser.add_argument('--size', type=_int_pair, default=(30, 30), help="ROWSxCOLS")
+    parser.add_argument('--density', type=float, default=0.3, help="wall density for the random style")
+    parser.add_argument('--style', default='random', choices=['random'] + list(generator_map))
+    parser.add_argument('--braid', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--algorithms', default='astar,bfs')
+    parser.add_argument('--traces', action='store_true', help="also store the visited order of every search")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    algorithms = args.algorithms.split(',')
+    unknown = [name for name in algorithms if name not in algorithm_map]
+    if unknown:
+        parser.error(f"Unknown algorithm: {', '.join(unknown)}")
+
+    config = {
+        "boards": args.boards,
+        "shardSize": args.shard_size,
+        "rows": args.size[0],
+        "cols": args.size[1],
+        "density": args.density,
+        "style": args.style,
+        "braid": args.braid,
+        "seed": args.seed,
+        "algorithms": algorithms,
+        "traces": args.traces
+    }
+
+    start_time = time.perf_counter()
+    try:
+        manifest = export_dataset(
+            args.out, config, args.workers,
+            progress=lambda shard: print(f"{shard['file']}: {shard['boards']} boards", flush=True)
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    elapsed = time.perf_counter() - start_time
+    boards = sum(shard["boards"] for shard in manifest["shards"])
+    print(f"{boards} boards in {len(manifest['shards'])} shards, {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+from math import ceil, isfinite
+
+# Upper bounds applied to every frame budget so a single request can never
+# ask for an unbounded animation
+MAX_FRAMES = 2000
+MAX_CELLS = 50000
+DEFAULT_CELLS = 20000
+
+
+def _positive_number(name, value):
+    """Check a client supplied budget value, JSON null counts as not given"""
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not isfinite(value) or value <= 0:
+        raise ValueError(f"{name} must be a positive number")
+    return value
+
+
+def frame_budget(max_frames=None, fps=None, duration=None):
+    """
+    Resolve the number of animation frames requested by the client.
+
+    Args:
+        max_frames: explicit frame count, takes precedence when given
+        fps: target frames per second
+        duration: target playback duration in seconds
+
+    Returns:
+        Frame count clamped to [1, MAX_FRAMES], or None if no budget was requested
+
+    Raises:
+        ValueError: if any value is not a positive number
+    """
+    max_frames = _positive_number('maxFrames', max_frames)
+    fps = _positive_number('fps', fps)
+    duration = _positive_number('duration', duration)
+
+    if max_frames is None:
+        if fps is None or duration is None:
+            return None
+        max_frames = fps * duration
+
+    return max(1, min(MAX_FRAMES, int(max_frames)))
+
+
+def cell_budget(max_cells=None):
+    """
+    Resolve the cap on visited cells shipped across all frames.
+
+    Returns:
+        Cell count clamped to [1, MAX_CELLS], DEFAULT_CELLS if none was requested
+
+    Raises:
+        ValueError: if max_cells is not a positive number
+    """
+    max_cells = _positive_number('maxCells', max_cells)
+    if max_cells is None:
+        return DEFAULT_CELLS
+    return max(1, min(MAX_CELLS, int(max_cells)))
+
+
+def decimate(cells, max_cells=DEFAULT_CELLS):
+    """
+    Thin an expansion order down to at most max_cells entries.
+
+    Cells are kept at a uniform stride so the decimated trace still sweeps
+    across the board in the same order as the full search did.
+    """
+    max_cells = max(1, min(MAX_CELLS, int(max_cells)))
+    if len(cells) <= max_cells:
+        return list(cells)
+
+    stride = len(cells) / max_cells
+    return [cells[int(i * stride)] for i in range(max_cells)]
+
+
+def batch_frames(cells, max_frames, max_cells=DEFAULT_CELLS):
+    """
+    Group an expansion order into animation frames.
+
+    Args:
+        cells: visited coordinates in expansion order
+        max_frames: number of frames to spread the trace over
+        max_cells: cap on the total number of cells shipped across all frames
+
+    Returns:
+        List of frames, each a list of [row, col] cells to paint together
+    """
+    cells = decimate(cells, max_cells)
+    if not cells:
+        return []
+
+    # Spread the cells evenly so every frame paints roughly the same amount
+    per_frame = ceil(len(cells) / max_frames)
+    return [
+        [[coord.x, coord.y] for coord in cells[i:i + per_frame]]
+        for i in range(0, len(cells), per_frame)
+    ]
@@ -0,0 +1,175 @@
+import random
+from array import array
+
+from api.maze import Coordinate
+
+# Mazes are carved on a flat bytearray of rows * cols cells where 1 = wall.
+# Passage cells sit on even (row, col) positions and the cells between two
+# of them are the walls that get knocked down, so every generator produces
+# a perfect maze (exactly one path between any two cells) by construction.
+
+
+def _cell_grid(rows, cols):
+    return (rows + 1) // 2, (cols + 1) // 2
+
+
+def _carve_cells(walls, cols, height, width):
+    for i in range(height):
+        for j in range(width):
+            walls[2 * i * cols + 2 * j] = 0
+
+
+def _knock(walls, cols, width, a, b):
+    """Open the wall between neighbouring cells a and b (cell grid indices)"""
+    ai, aj = divmod(a, width)
+    bi, bj = divmod(b, width)
+    walls[(ai + bi) * cols + (aj + bj)] = 0
+
+
+def _neighbours(cell, height, width):
+    i, j = divmod(cell, width)
+    if i > 0: yield cell - width
+    if j > 0: yield cell - 1
+    if j < width - 1: yield cell + 1
+    if i < height - 1: yield cell + width
+
+
+def recursive_backtracker(walls, rows, cols, rng):
+    """Depth-first carving with an explicit stack, long winding corridors"""
+    height, width = _cell_grid(rows, cols)
+    _carve_cells(walls, cols, height, width)
+
+    visited = bytearray(height * width)
+    stack = array('i', [0])
+    visited[0] = 1
+
+    while stack:
+        cell = stack[-1]
+        options = [n for n in _neighbours(cell, height, width) if not visited[n]]
+        if not options:
+            stack.pop()
+            continue
+
+        nxt = options[rng.randrange(len(options))] if len(options) > 1 else options[0]
+        _knock(walls, cols, width, cell, nxt)
+        visited[nxt] = 1
+        stack.append(nxt)
+
+
+def kruskal(walls, rows, cols, rng):
+    """Random spanning tree through union-find over shuffled walls, many short dead ends"""
+    height, width = _cell_grid(rows, cols)
+    _carve_cells(walls, cols, height, width)
+
+    # Candidate walls encoded as cell * 2 + direction (0 = right, 1 = down)
+    edges = array('i')
+    for cell in range(height * width):
+        i, j = divmod(cell, width)
+        if j < width - 1: edges.append(cell * 2)
+        if i < height - 1: edges.append(cell * 2 + 1)
+    rng.shuffle(edges)
+
+    parent = array('i', range(height * width))
+
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    for edge in edges:
+        a, direction = divmod(edge, 2)
+        b = a + width if direction else a + 1
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_a] = root_b
+            _knock(walls, cols, width, a, b)
+
+
+def prim(walls, rows, cols, rng):
+    """Randomised Prim's growing from a frontier of walls, radial branching"""
+    height, width = _cell_grid(rows, cols)
+    _carve_cells(walls, cols, height, width)
+
+    visited = bytearray(height * width)
+    visited[0] = 1
+
+    # Frontier walls encoded as from_cell * 4 + direction
+    offsets = (-width, -1, 1, width)
+    frontier = array('i')
+
+    def add_frontier(cell):
+        i, j = divmod(cell, width)
+        if i > 0 and not visited[cell - width]: frontier.append(cell * 4)
+        if j > 0 and not visited[cell - 1]: frontier.append(cell * 4 + 1)
+        if j < width - 1 and not visited[cell + 1]: frontier.append(cell * 4 + 2)
+        if i < height - 1 and not visited[cell + width]: frontier.append(cell * 4 + 3)
+
+    add_frontier(0)
+    while frontier:
+        # Swap-remove a random frontier wall
+        k = rng.randrange(len(frontier))
+        frontier[k], frontier[-1] = frontier[-1], frontier[k]
+        a, direction = divmod(frontier.pop(), 4)
+        b = a + offsets[direction]
+        if visited[b]:
+            continue
+
+        _knock(walls, cols, width, a, b)
+        visited[b] = 1
+        add_frontier(b)
+
+
+def braid(walls, rows, cols, rng, amount):
+    """
+    Remove a fraction of the dead ends by opening one extra wall at each.
+
+    This adds loops, so the maze is no longer perfect but stays solvable.
+    """
+    height, width = _cell_grid(rows, cols)
+    for cell in range(height * width):
+        i, j = divmod(cell, width)
+        options = list(_neighbours(cell, height, width))
+        closed = [n for n in options if walls[(i + n // width) * cols + (j + n % width)]]
+        if len(options) - len(closed) == 1 and closed and rng.random() < amount:
+            _knock(walls, cols, width, cell, closed[rng.randrange(len(closed))])
+
+
+# Structured generators selectable through the generate endpoint
+generator_map = {
+    'backtracker': recursive_backtracker,
+    'kruskal': kruskal,
+    'prim': prim,
+}
+
+
+def generate(style, rows, cols, seed=None, braid_amount=0.0):
+    """
+    Generate a structured maze on a flat wall buffer.
+
+    Args:
+        style: key of generator_map
+        rows: number of rows in the grid
+        cols: number of columns in the grid
+        seed: seed for the generator's own RNG, None for a random maze
+        braid_amount: 0.0 to 1.0, fraction of dead ends to open into loops
+
+    Returns:
+        (walls, start, end) where walls is a bytearray of rows * cols with 1 = wall
+    """
+    rng = random.Random(seed)
+    walls = bytearray(b'\x01') * (rows * cols)
+
+    generator_map[style](walls, rows, cols, rng)
+    if braid_amount > 0:
+        braid(walls, rows, cols, rng, braid_amount)
+
+    # Opposite corner cells, the end sits on the last even row and column
+    start = Coordinate(0, 0)
+    end = Coordinate((rows - 1) // 2 * 2, (cols - 1) // 2 * 2)
+    return walls, start, end
+
+
+def wall_rows(walls, rows, cols):
+    """Split a flat wall buffer into a list of rows of booleans"""
+    return [[bool(cell) for cell in walls[r * cols:(r + 1) * cols]] for r in range(rows)]
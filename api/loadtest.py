@@ -0,0 +1,309 @@
+import json
+import time
+import random
+import argparse
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from math import ceil
+from concurrent.futures import ThreadPoolExecutor
+
+from api.maze import Maze
+from api.algo import algorithm_map
+
+ROUTES = {
+    'solve': '/api/solve',
+    'validate': '/api/maze/validate',
+    'generate': '/api/maze/generate',
+    'seeded': '/api/maze/generate',
+}
+
+# Routes sent as GET with a query string, like a browser fetching a seeded
+# maze, revalidating with the ETag it got last time
+GET_ROUTES = {'seeded'}
+
+
+def _int_list(value):
+    return [int(item) for item in value.split(',')]
+
+
+def _mix(value):
+    """Parse 'solve=0.7,validate=0.2,generate=0.1' into route weights"""
+    weights = {}
+    for item in value.split(','):
+        route, weight = item.split('=')
+        if route not in ROUTES:
+            raise argparse.ArgumentTypeError(f"Unknown route: {route}")
+        weights[route] = float(weight)
+    return weights
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return None
+    return values[max(0, ceil(pct / 100 * len(values)) - 1)]
+
+
+def build_requests(sizes, algorithms, density=0.3, boards=5, seed=0):
+    """
+    Pre-encode request bodies for every route so the load loop only sends bytes.
+
+    Returns:
+        Dict of route -> list of JSON encoded bodies, or query strings for
+        the GET routes
+    """
+    rng = random.Random(seed)
+    random.seed(seed)
+
+    bodies = {route: [] for route in ROUTES}
+    for size in sizes:
+        for _ in range(boards):
+            maze = Maze(rows=size, columns=size, barriers=density, random_obstacles=True)
+            board = {
+                "grid": [[cell == 'X' for cell in row] for row in maze.maze],
+                "start": list(maze.start_node),
+                "end": list(maze.end_node)
+            }
+            bodies['validate'].append(json.dumps(board).encode())
+            for algorithm in algorithms:
+                bodies['solve'].append(json.dumps({**board, "algorithm": algorithm}).encode())
+
+        bodies['generate'].append(json.dumps({"rows": size, "cols": size, "density": density}).encode())
+        for seed_value in range(boards):
+            bodies['seeded'].append(urllib.parse.urlencode({
+                "rows": size, "cols": size, "density": density, "seed": seed_value
+            }))
+
+    for route in bodies:
+        rng.shuffle(bodies[route])
+    return bodies
+
+
+def _server_timing(header):
+    """Parse 'parse;dur=1.2, search;dur=8.4' into {"parse": 1.2, "search": 8.4}"""
+    phases = {}
+    for entry in (header or '').split(','):
+        name, *params = entry.strip().split(';')
+        for param in params:
+            key, _, value = param.partition('=')
+            if name and key.strip() == 'dur':
+                try:
+                    phases[name] = float(value)
+                except ValueError:
+                    pass
+    return phases
+
+
+def _send(base_url, route, body, etags):
+    if route in GET_ROUTES:
+        url = f"{base_url}{ROUTES[route]}?{body}"
+        headers = {'Accept-Encoding': 'gzip'}
+        if url in etags:
+            headers['If-None-Match'] = etags[url]
+        request = urllib.request.Request(url, headers=headers)
+    else:
+        url = None
+        request = urllib.request.Request(
+            base_url + ROUTES[route],
+            data=body,
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+    try:
+        with urllib.request.urlopen(request) as response:
+            payload = response.read()
+            status = response.status
+            headers = response.headers
+    except urllib.error.HTTPError as e:
+        payload = e.read()
+        status = e.code
+        headers = e.headers
+    except OSError:
+        return 0, None, {}
+
+    if url and headers.get('ETag'):
+        etags[url] = headers['ETag']
+
+    # Server-side search time lets us split latency into search and everything else
+    search_time = None
+    if route == 'solve' and status == 200:
+        try:
+            search_time = json.loads(payload)["stats"]["timeTaken"]
+        except (ValueError, KeyError, TypeError):
+            pass
+    return status, search_time, _server_timing(headers.get('Server-Timing'))
+
+
+def run_load(base_url, bodies, mix, concurrency=8, requests=200, rate=None, duration=None, seed=0):
+    """
+    Replay a weighted mix of requests against a running server.
+
+    With rate set, requests are issued on a fixed schedule for duration seconds
+    (open loop) and latency is measured from each request's scheduled time, so
+    a slow server is not hidden by the client waiting on it. Otherwise
+    concurrency workers send requests back to back until requests are done
+    (closed loop).
+
+    Seeded generate requests revalidate with the ETag of the last response
+    for the same URL, the way a browser would, so repeats are 304s.
+
+    Returns:
+        List of (route, status, latency ms, search time ms, server phases)
+        samples and the wall time in seconds
+    """
+    rng = random.Random(seed)
+    routes = [route for route in mix if bodies[route]]
+    weights = [mix[route] for route in routes]
+
+    total = int(rate * duration) if rate else requests
+    plan = [rng.choices(routes, weights)[0] for _ in range(total)]
+    counters = {route: 0 for route in routes}
+
+    samples = []
+    etags = {}
+    lock = threading.Lock()
+
+    def fire(route, scheduled):
+        with lock:
+            body = bodies[route][counters[route] % len(bodies[route])]
+            counters[route] += 1
+        if rate:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        start_time = scheduled if rate else time.perf_counter()
+        status, search_time, phases = _send(base_url, route, body, etags)
+        latency = (time.perf_counter() - start_time) * 1000
+        with lock:
+            samples.append((route, status, latency, search_time, phases))
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for i, route in enumerate(plan):
+            scheduled = wall_start + i / rate if rate else None
+            executor.submit(fire, route, scheduled)
+    wall_time = time.perf_counter() - wall_start
+
+    return samples, wall_time
+
+
+def summarize(samples, wall_time):
+    """Throughput and latency percentiles per route and overall"""
+    def describe(group):
+        latencies = sorted(sample[2] for sample in group)
+        search_times = sorted(sample[3] for sample in group if sample[3] is not None)
+        summary = {
+            "count": len(group),
+            "errors": sum(1 for sample in group if not (200 <= sample[1] < 300 or sample[1] == 304)),
+            "notModified": sum(1 for sample in group if sample[1] == 304),
+            "throughput": round(len(group) / wall_time, 2) if wall_time else None,
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None
+        }
+        if search_times:
+            summary["searchTime"] = {
+                "p50": percentile(search_times, 50),
+                "p95": percentile(search_times, 95),
+                "p99": percentile(search_times, 99)
+            }
+
+        # Where server time goes, from each response's Server-Timing header
+        phase_names = sorted({name for sample in group for name in sample[4]})
+        if phase_names:
+            summary["serverPhases"] = {}
+            for name in phase_names:
+                durations = sorted(sample[4][name] for sample in group if name in sample[4])
+                summary["serverPhases"][name] = {
+                    "count": len(durations),
+                    "p50": percentile(durations, 50),
+                    "p95": percentile(durations, 95),
+                    "p99": percentile(durations, 99)
+                }
+        for key in ("p50", "p95", "p99", "max"):
+            if summary[key] is not None:
+                summary[key] = round(summary[key], 3)
+        return summary
+
+    routes = sorted({sample[0] for sample in samples})
+    return {
+        "wallTime": round(wall_time, 3),
+        "overall": describe(samples),
+        "routes": {route: describe([s for s in samples if s[0] == route]) for route in routes}
+    }
+
+
+def serve_locally():
+    """Start the Flask app on a free local port in a background thread"""
+    from werkzeug.serving import make_server, WSGIRequestHandler
+    from api.app import app
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Path Visualizer API")
+    parser.add_argument('--url', help="target an already running server instead of starting one")
+    parser.add_argument('--sizes', type=_int_list, default=[30, 100])
+    parser.add_argument('--algorithms', default='astar,bfs,dijkstra')
+    parser.add_argument('--mix', type=_mix, default=_mix('solve=0.7,validate=0.15,generate=0.05,seeded=0.1'))
+    parser.add_argument('--density', type=float, default=0.3)
+    parser.add_argument('--boards', type=int, default=5, help="boards per size")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200, help="total requests (closed loop)")
+    parser.add_argument('--rate', type=float, help="requests per second (open loop)")
+    parser.add_argument('--duration', type=float, default=30.0, help="seconds to run at --rate")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help="write the JSON report here as well as to stdout")
+    args = parser.parse_args(argv)
+
+    algorithms = args.algorithms.split(',')
+    unknown = [name for name in algorithms if name not in algorithm_map]
+    if unknown:
+        parser.error(f"Unknown algorithm: {', '.join(unknown)}")
+
+    bodies = build_requests(args.sizes, algorithms, args.density, args.boards, args.seed)
+
+    server, base_url = (None, args.url.rstrip('/')) if args.url else serve_locally()
+    try:
+        samples, wall_time = run_load(
+            base_url, bodies, args.mix, args.concurrency, args.requests, args.rate, args.duration, args.seed
+        )
+    finally:
+        if server:
+            server.shutdown()
+
+    report = {
+        "config": {
+            "sizes": args.sizes,
+            "algorithms": algorithms,
+            "mix": args.mix,
+            "density": args.density,
+            "concurrency": args.concurrency,
+            "mode": "rate" if args.rate else "concurrency",
+            "requests": len(samples),
+            "rate": args.rate,
+            "duration": args.duration if args.rate else None
+        },
+        **summarize(samples, wall_time)
+    }
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Thread-safe least recently used cache, bounded by entries and total size.
+
+    Values are built outside the lock, so a slow build never blocks lookups
+    of other keys. Two threads missing the same key at once both build it
+    and the later one is kept.
+    """
+
+    def __init__(self, max_entries, max_size=None, size=None):
+        """
+        Args:
+            max_entries: most values kept at once
+            max_size: optional bound on the sum of size(value) over the cache,
+                a single value larger than it is returned without being kept
+            size: callable giving the size of a value, required with max_size
+        """
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = size
+        self.total_size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """
+        Returns the value for key, creating it with build() on a miss.
+
+        Returns:
+            (value, cached) where cached tells whether it came from the cache
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0], True
+
+        value = build()
+        value_size = self.size(value) if self.max_size is not None else 0
+        if self.max_size is not None and value_size > self.max_size:
+            return value, False
+
+        with self._lock:
+            if key in self._entries:
+                self.total_size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, value_size)
+            self.total_size += value_size
+            while len(self._entries) > self.max_entries or (
+                    self.max_size is not None and self.total_size > self.max_size):
+                self.total_size -= self._entries.popitem(last=False)[1][1]
+        return value, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_size = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,4 +1,5 @@
 import random
+import hashlib
 from typing import NamedTuple
 from tabulate import tabulate
 from IPython.core.display import HTML
@@ -21,6 +22,21 @@ class MazeSymbol:
 
 default_obstacles = set()
 
+# Background classes for each maze symbol, anything else is a path or weight
+cell_type = {
+    MazeSymbol.start_node : 'bg-green-700',
+    MazeSymbol.empty : 'bg-white/20',
+    MazeSymbol.end_node : 'bg-red-700',
+    MazeSymbol.wall : 'bg-slate-800',
+}
+path_class = "bg-slate-500/50"
+cell_class = "flex flex-col w-12 h-12 text-center justify-center font-bold border-2 border-gray-200/20"
+
+
+def _cell_html(node):
+    current_class = cell_type.get(node, path_class)
+    return f"<div class='{cell_class} {current_class} '>{node}</div>"
+
 class Maze:
 
     def __init__(
@@ -31,7 +47,8 @@ class Maze:
         start_node=None,
         end_node=None,
         random_obstacles=False,
-        custom_obstacles=default_obstacles):
+        custom_obstacles=default_obstacles,
+        seed=None):
 
             # Maze Dimensions
             self.rows = rows
@@ -47,6 +64,10 @@ class Maze:
             # Obstacle Configuration
             self.custom_obstacles = custom_obstacles
             self.random_obstacles = random_obstacles
+
+            # Random obstacles come from a private RNG when seeded, so the same seed gives the same maze
+            self.seed = seed
+            self._random = random.Random(seed) if seed is not None else random
                 
             # Maze Initialization
             self.maze = [[MazeSymbol.empty for col in range(columns)] for row in range(rows)]
@@ -61,7 +82,7 @@ class Maze:
         for row in range(self.rows):
             for col in range(self.columns):
                 # If random obstacles are enabled and a random value is within the barrier density
-                if random_obstacles and random.uniform(0, 1) <= self.barriers:
+                if random_obstacles and self._random.uniform(0, 1) <= self.barriers:
                     self.maze[row][col] = MazeSymbol.wall
                 # If custom obstacles are specified and the current cell is in the custom obstacles list
                 elif not random_obstacles and (row, col) in self.custom_obstacles:
@@ -88,6 +109,15 @@ class Maze:
             next_moves.append(Coordinate(curr.x + 1, curr.y))
         return next_moves
 
+    def step_cost(self, curr, neighbor):
+        """Cost of moving between two neighbouring locations, every step costs 1 on the grid"""
+        return 1
+
+    def wall_hash(self):
+        """Digest of the grid size and wall layout, used to cache per-grid preprocessing"""
+        walls = bytes(cell == MazeSymbol.wall for row in self.maze for cell in row)
+        return hashlib.blake2b(f"{self.rows}x{self.columns}:".encode() + walls, digest_size=16).hexdigest()
+
     def end_node_line(self, curr):
         if curr.x == self.end_node.x and curr.y == self.end_node.y:
             return True
@@ -110,44 +140,19 @@ class Maze:
         return tabulate(self.maze, tablefmt="heavy_grid", stralign="center")
     
     def copy(self):
-        """Returns a copy of the current maze"""
-        return Maze(
-            rows=self.rows,
-            columns=self.columns,
-            barriers=self.barriers,
-            start_node=self.start_node,
-            end_node=self.end_node,
-            random_obstacles=self.random_obstacles,
-            custom_obstacles=self.custom_obstacles
-        )
+        """Returns a copy of the current maze, walls included, without regenerating it"""
+        maze = type(self).__new__(type(self))
+        maze.__dict__.update(self.__dict__)
+        maze.maze = [row[:] for row in self.maze]
+        return maze
+
+    def overlay(self):
+        """Returns an empty path overlay drawn on top of this maze"""
+        return PathOverlay(self)
     
     def display_maze(self, return_html=False):
         """Draws the maze in the browser"""
-
-        html_content = ""
-        cell_type = {
-            'S' : 'bg-green-700',
-            ' ' : 'bg-white/20',
-            'E' : 'bg-red-700',
-            'X' : 'bg-slate-800',
-        }
-
-        for row in self.maze:
-            html_content += "<div class='flex flex-row'>"
-            for node in row:
-                current_class = "bg-slate-500/50" if node not in cell_type else cell_type[node]
-                html_content += f"<div class='flex flex-col w-12 h-12 text-center justify-center font-bold border-2 border-gray-200/20 {current_class} '>{node}</div>"
-            html_content += "</div>"
-
-
-        html_content = f"""
-        <table class="table-auto">
-            {html_content}
-        </table>
-        """
-
-        if return_html: return html_content
-        return HTML(html_content)
+        return _display_grid(self.maze, return_html)
 
     @classmethod
     def from_grid_state(cls, grid_state, start, end):
@@ -181,6 +186,131 @@ class Maze:
             custom_obstacles=obstacles
         )
 
+    @classmethod
+    def from_walls(cls, walls, start, end):
+        """
+        Create a Maze from a 2D wall array without going through the obstacle set.
+
+        Args:
+            walls: 2D array-like (e.g. a numpy bool array) where truthy = wall
+            start: [row, col] of start position
+            end: [row, col] of end position
+
+        Returns:
+            Maze instance, an endpoint on a wall is left as a wall
+        """
+        maze = cls.__new__(cls)
+        maze.rows = len(walls)
+        maze.columns = len(walls[0]) if maze.rows else 0
+        maze.barriers = 0.0
+        maze.start_node = Coordinate(start[0], start[1])
+        maze.end_node = Coordinate(end[0], end[1])
+        maze.custom_obstacles = default_obstacles
+        maze.random_obstacles = False
+        maze.seed = None
+        maze._random = random
+
+        # Keep the source array so cells can be restored when the endpoints move
+        maze.walls = walls
+        maze.maze = [
+            [MazeSymbol.wall if cell else MazeSymbol.empty for cell in (row.tolist() if hasattr(row, 'tolist') else row)]
+            for row in walls
+        ]
+
+        maze._mark_endpoints()
+        return maze
+
+    def _mark_endpoints(self):
+        """Write the start and end symbols onto their cells unless a wall is there"""
+        for loc, symbol in ((self.start_node, MazeSymbol.start_node), (self.end_node, MazeSymbol.end_node)):
+            if self.maze[loc.x][loc.y] != MazeSymbol.wall:
+                self.maze[loc.x][loc.y] = symbol
+
+    def _unmarked_symbol(self, loc):
+        """Symbol of a cell without the endpoint markers, taken from the wall array when there is one"""
+        walls = getattr(self, 'walls', None)
+        if walls is not None and walls[loc.x][loc.y]:
+            return MazeSymbol.wall
+        return MazeSymbol.empty
+
+    def with_endpoints(self, start_node, end_node):
+        """
+        Returns a maze sharing this maze's walls with different start and end nodes.
+
+        Only the rows holding the old and new start and end nodes are copied,
+        the rest of the grid is shared with this maze.
+        """
+        maze = type(self).__new__(type(self))
+        maze.__dict__.update(self.__dict__)
+        maze.maze = list(self.maze)
+        maze.start_node = Coordinate(*start_node)
+        maze.end_node = Coordinate(*end_node)
+
+        for row in {self.start_node.x, self.end_node.x, maze.start_node.x, maze.end_node.x}:
+            maze.maze[row] = self.maze[row][:]
+        for loc in (self.start_node, self.end_node):
+            maze.maze[loc.x][loc.y] = self._unmarked_symbol(loc)
+        maze._mark_endpoints()
+        return maze
+
+
+class PathOverlay:
+    """
+    Path and weight symbols drawn over a maze without modifying it.
+
+    The base maze is only read, so a single board can back any number of
+    overlays, e.g. one per concurrent solve.
+    """
+
+    def __init__(self, maze):
+        self.base = maze
+        self.cells = {}
+
+    def draw_path(self, path):
+        for loc in path:
+            self.cells[loc] = MazeSymbol.path
+
+    def draw_weighted_path(self, path, weights):
+        for loc in path:
+            self.cells[loc] = weights[loc]
+
+    def clear_path(self, path):
+        for loc in path:
+            self.cells.pop(loc, None)
+
+    @property
+    def maze(self):
+        """The base grid with the overlay applied, only touched rows are copied"""
+        grid = list(self.base.maze)
+        for loc, symbol in self.cells.items():
+            if grid[loc.x] is self.base.maze[loc.x]:
+                grid[loc.x] = grid[loc.x][:]
+            grid[loc.x][loc.y] = symbol
+        return grid
+
+    def __str__(self):
+        return tabulate(self.maze, tablefmt="heavy_grid", stralign="center")
+
+    def display_maze(self, return_html=False):
+        """Draws the maze with the overlay in the browser"""
+        return _display_grid(self.maze, return_html)
+
+
+def _display_grid(grid, return_html):
+    html_content = "".join(
+        f"<div class='flex flex-row'>{''.join(_cell_html(node) for node in row)}</div>"
+        for row in grid
+    )
+
+    html_content = f"""
+        <table class="table-auto">
+            {html_content}
+        </table>
+        """
+
+    if return_html: return html_content
+    return HTML(html_content)
+
 
 def draw_mazes(mazes, title, final_path_lenth, runtime, final_maze):
         output = ""
@@ -222,4 +352,88 @@ def draw_mazes(mazes, title, final_path_lenth, runtime, final_maze):
             </div>
         """
         
-        return HTML(output)
\ No newline at end of file
+        return HTML(output)
+
+
+def trace_deltas(trace, weights=None):
+    """
+    Converts a search trace into per-step cell updates.
+
+    Args:
+        trace: locations in the order the search explored them
+        weights: optional cost per location, drawn instead of the path symbol
+
+    Returns:
+        Dict of location -> (step, symbol) for the first step each cell is revealed
+    """
+    deltas = {}
+    for step, loc in enumerate(trace, start=1):
+        if loc not in deltas:
+            deltas[loc] = (step, MazeSymbol.path if weights is None else weights[loc])
+    return deltas
+
+
+def draw_trace(maze, trace, title, final_path, runtime, weights=None, interval=150):
+    """
+    Renders a search trace as a single animated grid.
+
+    The base grid is rendered once and each explored cell carries an overlay
+    revealed after its step's delay, so the cost is linear in the number of
+    cells plus the length of the trace instead of one full grid per step.
+
+    Args:
+        maze: Maze the search ran on, left unmodified
+        trace: locations in the order the search explored them
+        title: heading shown above the grid
+        final_path: locations of the final path
+        runtime: runtime shown in the summary
+        weights: optional cost per location, drawn instead of the path symbol
+        interval: milliseconds between steps
+    """
+    deltas = trace_deltas(trace, weights)
+    final_maze = maze.overlay()
+    final_maze.draw_path(final_path)
+
+    def traced_cell(loc, node):
+        if loc not in deltas:
+            return _cell_html(node)
+        step, symbol = deltas[loc]
+        return (
+            f"<div class='{cell_class} {cell_type.get(node, path_class)} relative'>{node}"
+            f"<div class='trace-step absolute inset-0 flex items-center justify-center {path_class}' "
+            f"style='animation-delay: {step * interval}ms'>{symbol}</div></div>"
+        )
+
+    traced_grid = "".join(
+        "<div class='flex flex-row'>"
+        + "".join(traced_cell(Coordinate(x, y), node) for y, node in enumerate(row))
+        + "</div>"
+        for x, row in enumerate(maze.maze)
+    )
+
+    output = f"""
+        <style>
+            .trace-step {{ opacity: 0; animation: trace-reveal 0s linear forwards; }}
+            @keyframes trace-reveal {{ to {{ opacity: 1; }} }}
+        </style>
+        <div class="flex flex-col justify-center items-center py-8">
+            <div class="text-2xl font-bold text-center pb-3">{title}</div>
+            <div class="flex flex-row justify-center items-center space-x-8">
+                <div class="text-lg text-center">Nodes Explored: {len(trace)}</div>
+                <div class="text-lg text-center">Final Path Length: {len(final_path)}</div>
+                <div class="text-lg text-center">Runtime: {runtime}</div>
+            </div>
+        </div>
+        <div class="flex flex-row justify-center items-start space-x-8">
+            <div class="flex flex-col justify-center items-center space-y-4 p-4">
+                <div class="text-lg font-bold text-center">Search Trace</div>
+                <div class="flex flex-col">{traced_grid}</div>
+            </div>
+            <div class="flex flex-col justify-center items-center space-y-4 p-4 bg-gradient-to-r from-green-300/50 to-green-800/50">
+                <div class="text-lg font-bold text-center">Final Path</div>
+                <div class="flex flex-col">{final_maze.display_maze(True)}</div>
+            </div>
+        </div>
+    """
+
+    return HTML(output)
@@ -0,0 +1,55 @@
+import os
+import gzip
+import json
+import hashlib
+
+from api.lru import LRUCache
+
+# Seeded configurations encoded ahead of time when PATHVIZ_WARM_POOL is set:
+# (rows, cols, density, style) with seeds 0 to POOL_SEEDS - 1
+POPULAR_CONFIGS = [(15, 15, 0.3, 'random')]
+POOL_SEEDS = 32
+WARM_POOL = os.environ.get('PATHVIZ_WARM_POOL', '').lower() in ('1', 'true')
+
+# A 1000x1000 body is about 5.5 MB with its gzip form, so the pool is bounded
+# by bytes as well as entries
+MAX_POOL_ENTRIES = 512
+MAX_POOL_BYTES = int(os.environ.get('PATHVIZ_POOL_BYTES', 64 * 1024 * 1024))
+
+
+class EncodedBody:
+    """A JSON response body encoded once, with its gzip form and strong ETag"""
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload, separators=(',', ':'), sort_keys=True).encode()
+        self.gzipped = gzip.compress(self.body, compresslevel=9, mtime=0)
+        self.etag = hashlib.blake2b(self.body, digest_size=16).hexdigest()
+
+    def size(self):
+        """Bytes held for this body, plain and gzipped"""
+        return len(self.body) + len(self.gzipped)
+
+
+class MazePool:
+    """
+    Bounded LRU pool of encoded generate responses.
+
+    Only seeded requests are pooled: their output is a pure function of the
+    parameters, so a repeat request costs a dictionary lookup. A body larger
+    than the whole byte budget is served without being pooled.
+    """
+
+    def __init__(self, max_entries=MAX_POOL_ENTRIES, max_bytes=MAX_POOL_BYTES):
+        self._entries = LRUCache(max_entries, max_bytes, size=EncodedBody.size)
+
+    def get(self, key, build):
+        """Returns the pooled EncodedBody for key, creating it with build() on a miss"""
+        entry, _ = self._entries.get(key, lambda: EncodedBody(build()))
+        return entry
+
+    @property
+    def total_bytes(self):
+        return self._entries.total_size
+
+    def __len__(self):
+        return len(self._entries)
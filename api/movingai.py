@@ -0,0 +1,316 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from api.maze import Maze, MazeSymbol, Coordinate
+from api.algo import algorithm_map, optimal_engines
+
+# Terrain that can be walked on in MovingAI maps, everything else is a wall
+PASSABLE_TERRAIN = {'.', 'G', 'S'}
+
+
+class Scenario:
+    """A single query from a MovingAI .scen file"""
+
+    def __init__(self, bucket, map_name, start, end, optimal):
+        self.bucket = bucket
+        self.map_name = map_name
+        self.start = start
+        self.end = end
+        self.optimal = optimal
+
+
+def read_map(path):
+    """
+    Parse a MovingAI .map file.
+
+    Returns:
+        2D numpy bool array where True = wall
+    """
+    with open(path) as f:
+        header = {}
+        for line in f:
+            line = line.strip()
+            if line == 'map':
+                break
+            key, value = line.split(maxsplit=1)
+            header[key] = value
+
+        height = int(header['height'])
+        width = int(header['width'])
+
+        walls = np.ones((height, width), dtype=bool)
+        for row in range(height):
+            line = f.readline().rstrip('\r\n')
+            walls[row] = [cell not in PASSABLE_TERRAIN for cell in line[:width]]
+
+    return walls
+
+
+def convert_map(map_path, out_path=None):
+    """
+    Convert a MovingAI .map file to a .npy wall array that can be memory-mapped.
+
+    Returns:
+        Path of the written .npy file
+    """
+    out_path = out_path or os.path.splitext(map_path)[0] + '.npy'
+    np.save(out_path, read_map(map_path))
+    return out_path
+
+
+def open_map(npy_path):
+    """
+    Open a converted map read-only through mmap.
+
+    Opening is instant whatever the map size and nothing is parsed, and the
+    pages are the OS page cache's, shared by every process mapping the file.
+    """
+    return np.load(npy_path, mmap_mode='r')
+
+
+class MappedMaze(Maze):
+    """
+    Maze whose walls are read straight from a memory-mapped wall array.
+
+    Neighbour lookups index the mapped bytes, so worker processes running
+    queries on the same map share one copy of it. Engines that read the
+    symbol grid itself (jps, rsr and the reduced graph) get one built on
+    first use, once per process, without the start and end markers.
+    """
+
+    def __init__(self, walls, start_node=Coordinate(0, 0), end_node=Coordinate(0, 0)):
+        self.rows, self.columns = walls.shape
+        self.barriers = 0.0
+        self.start_node = Coordinate(*start_node)
+        self.end_node = Coordinate(*end_node)
+        self.custom_obstacles = set()
+        self.random_obstacles = False
+        self.seed = None
+
+        self.walls = walls
+        self.cells = memoryview(np.ascontiguousarray(walls).reshape(-1))
+        self._root = self
+        self._grid = None
+
+    @property
+    def maze(self):
+        root = self._root
+        if root._grid is None:
+            root._grid = [
+                [MazeSymbol.wall if cell else MazeSymbol.empty for cell in row.tolist()]
+                for row in root.walls
+            ]
+        return root._grid
+
+    @maze.setter
+    def maze(self, grid):
+        # A copied or drawn-on grid belongs to this maze alone
+        self._root = self
+        self._grid = grid
+
+    def get_neighbors(self, curr):
+        """Same moves in the same order as Maze.get_neighbors, read from the mapped cells"""
+        cells, columns = self.cells, self.columns
+        index = curr.x * columns + curr.y
+        next_moves = []
+        if curr.x - 1 >= 0 and not cells[index - columns]:
+            next_moves.append(Coordinate(curr.x - 1, curr.y))
+        if curr.y - 1 >= 0 and not cells[index - 1]:
+            next_moves.append(Coordinate(curr.x, curr.y - 1))
+        if curr.y + 1 < columns and not cells[index + 1]:
+            next_moves.append(Coordinate(curr.x, curr.y + 1))
+        if curr.x + 1 < self.rows and not cells[index + columns]:
+            next_moves.append(Coordinate(curr.x + 1, curr.y))
+        return next_moves
+
+    def wall_hash(self):
+        """Same digest as Maze.wall_hash, hashed from the mapped cells without a grid"""
+        digest = hashlib.blake2b(f"{self.rows}x{self.columns}:".encode(), digest_size=16)
+        digest.update(self.cells)
+        return digest.hexdigest()
+
+    def with_endpoints(self, start_node, end_node):
+        """Returns a maze on the same mapped walls with different start and end nodes"""
+        maze = type(self).__new__(type(self))
+        maze.__dict__.update(self.__dict__)
+        maze.start_node = Coordinate(*start_node)
+        maze.end_node = Coordinate(*end_node)
+        return maze
+
+
+def read_scenarios(path):
+    """
+    Parse a MovingAI .scen file.
+
+    Coordinates in the file are (x, y) = (column, row) and are returned as
+    Coordinate(row, column) to match the rest of the project.
+    """
+    scenarios = []
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if not fields or fields[0] == 'version':
+                continue
+
+            bucket, map_name = int(fields[0]), fields[1]
+            start_col, start_row, end_col, end_row = map(int, fields[4:8])
+            scenarios.append(Scenario(
+                bucket,
+                map_name,
+                Coordinate(start_row, start_col),
+                Coordinate(end_row, end_col),
+                float(fields[8])
+            ))
+
+    return scenarios
+
+
+def path_cost(maze, path):
+    """
+    Number of moves along a solved path, or None if the path is not a valid walk.
+
+    Algorithms return the path without its start and end nodes, so both are
+    added back first. Consecutive nodes may be a straight jump apart (as with
+    jump point search), every cell crossed on the way must be open.
+    """
+    full_path = [maze.start_node] + list(path) + [maze.end_node]
+    if maze.start_node == maze.end_node:
+        full_path = [maze.start_node]
+
+    cost = 0
+    for prev, curr in zip(full_path, full_path[1:]):
+        if prev.x != curr.x and prev.y != curr.y or prev == curr:
+            return None
+
+        step = Coordinate((curr.x > prev.x) - (curr.x < prev.x), (curr.y > prev.y) - (curr.y < prev.y))
+        loc = prev
+        while loc != curr:
+            nxt = Coordinate(loc.x + step.x, loc.y + step.y)
+            if nxt not in maze.get_neighbors(loc):
+                return None
+            loc = nxt
+            cost += 1
+
+    return cost
+
+
+# Maze on the mapped walls of the map each worker process is running
+# queries on, given each query's endpoints with with_endpoints
+_worker_maze = None
+
+
+def _init_worker(npy_path):
+    global _worker_maze
+    _worker_maze = MappedMaze(open_map(npy_path))
+
+
+def _run_query(task):
+    index, scenario, algorithms = task
+    maze = _worker_maze.with_endpoints(scenario.start, scenario.end)
+
+    # Scenario lengths are octile (8-connected) optima, the engines here move
+    # in 4 directions, so the exact optimum to check against comes from A*
+    reference_path, _ = algorithm_map['astar'](maze)
+    reference = path_cost(maze, reference_path) if reference_path is not None else None
+
+    results = []
+    for algorithm in algorithms:
+        start_time = time.perf_counter()
+        final_path, visited_path = algorithm_map[algorithm](maze)
+        time_taken = (time.perf_counter() - start_time) * 1000
+
+        cost = path_cost(maze, final_path) if final_path is not None else None
+
+        # A path must be a valid walk, and a shortest one from engines that promise it
+        if final_path is None:
+            valid = reference is None
+        else:
+            valid = cost is not None and (algorithm not in optimal_engines or cost == reference)
+
+        results.append({
+            "query": index,
+            "bucket": scenario.bucket,
+            "algorithm": algorithm,
+            "start": list(scenario.start),
+            "end": list(scenario.end),
+            "optimal": reference,
+            "octileOptimal": scenario.optimal,
+            "cost": cost,
+            "expansions": len(visited_path) if visited_path else 0,
+            "timeTaken": round(time_taken, 3),
+            "valid": valid,
+            "octileGap": None if cost is None else round(cost - scenario.optimal, 6)
+        })
+
+    return results
+
+
+def run_scenarios(scen_path, npy_path, out_path, algorithms=None, workers=None):
+    """
+    Run every query of a .scen file against the given algorithms in parallel.
+
+    Results are written to out_path as JSON lines, one per (query, algorithm),
+    as soon as each query finishes.
+
+    Returns:
+        Number of result lines written
+    """
+    algorithms = algorithms or list(algorithm_map)
+    tasks = ((i, scenario, algorithms) for i, scenario in enumerate(read_scenarios(scen_path)))
+
+    written = 0
+    with open(out_path, 'w') as out, ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(npy_path,)) as executor:
+        for results in executor.map(_run_query, tasks, chunksize=8):
+            for result in results:
+                out.write(json.dumps(result) + '\n')
+                written += 1
+            out.flush()
+
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MovingAI benchmark map import and scenario runner")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    convert = commands.add_parser('convert', help="convert a .map file to a memory-mappable .npy")
+    convert.add_argument('map')
+    convert.add_argument('out', nargs='?')
+
+    run = commands.add_parser('run', help="run a .scen file against the algorithms")
+    run.add_argument('scen')
+    run.add_argument('--map', required=True, help=".map or converted .npy file the scenario uses")
+    run.add_argument('--out', default='results.jsonl')
+    run.add_argument('--algorithms', default=','.join(algorithm_map))
+    run.add_argument('--workers', type=int, default=None)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        print(convert_map(args.map, args.out))
+        return
+
+    npy_path = args.map
+    if not npy_path.endswith('.npy'):
+        npy_path = os.path.splitext(npy_path)[0] + '.npy'
+        if not os.path.exists(npy_path) or os.path.getmtime(npy_path) < os.path.getmtime(args.map):
+            convert_map(args.map, npy_path)
+
+    algorithms = args.algorithms.split(',')
+    unknown = [name for name in algorithms if name not in algorithm_map]
+    if unknown:
+        parser.error(f"Unknown algorithm: {', '.join(unknown)}")
+
+    written = run_scenarios(args.scen, npy_path, args.out, algorithms, args.workers)
+    print(f"Wrote {written} results to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+import os
+import json
+import time
+import uuid
+import random
+import cProfile
+from functools import wraps
+from flask import request
+
+# Captures are only possible when a directory is configured, without it the
+# decorator hands back the view untouched so there is no per-request cost
+PROFILE_DIR = os.environ.get('PATHVIZ_PROFILE_DIR')
+
+# Fraction of requests profiled without being asked for, 0.0 to 1.0
+PROFILE_RATE = float(os.environ.get('PATHVIZ_PROFILE_RATE', 0.0))
+
+# Request header that profiles a single request on demand, only these values
+# turn it on so "0" or "false" leave the request unprofiled
+PROFILE_HEADER = 'X-Profile'
+PROFILE_HEADER_ON = {'1', 'true'}
+
+
+def _profile_requested():
+    return request.headers.get(PROFILE_HEADER, '').strip().lower() in PROFILE_HEADER_ON
+
+
+def profiled(view):
+    """
+    Profile a view with cProfile when requested by header or sampling rate.
+
+    Each capture writes <id>.pstats with the profile and <id>.json with the
+    request payload to PROFILE_DIR, which `python -m api.benchmark replay`
+    can run again offline.
+    """
+    if not PROFILE_DIR:
+        return view
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not _profile_requested() and not (PROFILE_RATE and random.random() < PROFILE_RATE):
+            return view(*args, **kwargs)
+
+        profiler = cProfile.Profile()
+        start_time = time.perf_counter()
+        result = profiler.runcall(view, *args, **kwargs)
+        time_taken = (time.perf_counter() - start_time) * 1000
+
+        save_capture(profiler, request.path, request.get_json(silent=True), time_taken)
+        return result
+
+    return wrapper
+
+
+def save_capture(profiler, path, payload, time_taken):
+    """
+    Write a profile and the request that produced it to PROFILE_DIR.
+
+    Returns:
+        Capture id, the file name shared by the .pstats and .json files
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    capture_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    profiler.dump_stats(os.path.join(PROFILE_DIR, f"{capture_id}.pstats"))
+    with open(os.path.join(PROFILE_DIR, f"{capture_id}.json"), 'w') as f:
+        json.dump({
+            "path": path,
+            "payload": payload,
+            "timeTaken": round(time_taken, 2)
+        }, f)
+
+    return capture_id
+
+
+class PhaseTimer:
+    """
+    Wall time spent in each phase of a request, for a Server-Timing header.
+
+    Each lap closes the phase running since the previous lap (or since the
+    timer was created), so phases cover the request back to back.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self._mark = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + (now - self._mark) * 1000
+        self._mark = now
+
+    def header(self):
+        """Server-Timing value, e.g. "parse;dur=1.20, search;dur=8.41" """
+        return ', '.join(f"{name};dur={duration:.2f}" for name, duration in self.phases.items())
@@ -0,0 +1,138 @@
+from collections import deque
+from api.maze import Coordinate, MazeSymbol
+from api.lru import LRUCache
+
+# Reduced graphs of recently searched boards, keyed by wall layout and
+# endpoints, shared by the threads of the dev server. Graphs hold a few
+# objects per open cell, so the cache is bounded by board cells as well.
+MAX_CACHED_GRIDS = 32
+MAX_CACHED_CELLS = 1_000_000
+_cache = LRUCache(MAX_CACHED_GRIDS, MAX_CACHED_CELLS, size=lambda graph: graph.rows * graph.columns)
+
+
+class ReducedGraph:
+    """
+    A maze with its dead ends removed and its corridors collapsed into edges.
+
+    Dead-end pockets that hold neither the start nor the end can never be on
+    a path and are pruned first. Every remaining cell with exactly two open
+    neighbours is part of a corridor, so only junctions (and the start and
+    end) are kept as nodes, joined by edges weighted with the corridor length.
+
+    It exposes the same start_node, end_node, get_neighbors, end_node_line
+    and step_cost interface as Maze, so the search functions in api/algo.py
+    run on it unchanged. Cost-aware searches (A*, Dijkstra, bidirectional)
+    stay optimal. BFS and DFS count edges, not cells, so /api/solve does not
+    run them on a reduced graph.
+    """
+
+    def __init__(self, maze):
+        self.start_node = maze.start_node
+        self.end_node = maze.end_node
+        self.rows = maze.rows
+        self.columns = maze.columns
+
+        adjacency = self._prune_dead_ends(maze)
+
+        # Corridors between two junctions: edges[a][b] = cells strictly between a and b
+        self.edges = {}
+        self._collapse_corridors(adjacency)
+
+    def _prune_dead_ends(self, maze):
+        keep = {self.start_node, self.end_node}
+
+        adjacency = {}
+        for x, row in enumerate(maze.maze):
+            for y, cell in enumerate(row):
+                if cell != MazeSymbol.wall:
+                    loc = Coordinate(x, y)
+                    adjacency[loc] = set(maze.get_neighbors(loc))
+        self.free_cells = len(adjacency)
+
+        # Repeatedly strip cells with at most one way in or out
+        queue = deque(loc for loc, neighbors in adjacency.items() if len(neighbors) <= 1 and loc not in keep)
+        pruned = 0
+        while queue:
+            loc = queue.popleft()
+            if loc not in adjacency:
+                continue
+            for neighbor in adjacency.pop(loc):
+                neighbors = adjacency[neighbor]
+                neighbors.discard(loc)
+                if len(neighbors) <= 1 and neighbor not in keep:
+                    queue.append(neighbor)
+            pruned += 1
+
+        self.pruned = pruned
+        return adjacency
+
+    def _collapse_corridors(self, adjacency):
+        def is_node(loc):
+            return len(adjacency[loc]) != 2 or loc == self.start_node or loc == self.end_node
+
+        for node in adjacency:
+            if not is_node(node):
+                continue
+            edges = self.edges.setdefault(node, {})
+
+            # Walk each corridor leaving the node until the next node
+            for step in adjacency[node]:
+                prev, curr, cells = node, step, []
+                while not is_node(curr):
+                    cells.append(curr)
+                    prev, curr = curr, next(n for n in adjacency[curr] if n != prev)
+
+                # Corridor loops back to where it started, it can never shorten a path
+                if curr == node:
+                    continue
+                if curr not in edges or len(edges[curr]) > len(cells):
+                    edges[curr] = cells
+
+    @property
+    def stats(self):
+        return {
+            "cells": self.free_cells,
+            "prunedDeadEnds": self.pruned,
+            "nodes": len(self.edges),
+            "edges": sum(len(edges) for edges in self.edges.values()) // 2
+        }
+
+    def get_neighbors(self, curr):
+        return list(self.edges.get(curr, ()))
+
+    def end_node_line(self, curr):
+        return curr == self.end_node
+
+    def step_cost(self, curr, neighbor):
+        return len(self.edges[curr][neighbor]) + 1
+
+    def expand_path(self, path):
+        """
+        Turn a path over graph nodes back into grid cells.
+
+        Like the search results, path excludes the start and end nodes and so
+        does the returned list of cells.
+        """
+        if path is None:
+            return None
+        if self.start_node == self.end_node:
+            return []
+
+        nodes = [self.start_node] + list(path) + [self.end_node]
+        cells = [nodes[0]]
+        for prev, curr in zip(nodes, nodes[1:]):
+            if prev == curr:
+                continue
+            cells.extend(self.edges.get(prev, {}).get(curr, ()))
+            cells.append(curr)
+        return cells[1:-1]
+
+
+def reduce_maze(maze):
+    """
+    Returns the reduced graph of a maze, cached per wall layout and endpoints.
+
+    Returns:
+        (graph, cached) where cached tells whether it came from the cache
+    """
+    return _cache.get((maze.wall_hash(), maze.start_node, maze.end_node), lambda: ReducedGraph(maze))
@@ -0,0 +1,180 @@
+from api.maze import Coordinate, MazeSymbol
+from api.lru import LRUCache
+
+# Below this share of free cells inside rectangle interiors there is too
+# little to prune, and the search steps cell by cell like A* instead
+MIN_INTERIOR_RATIO = 0.05
+
+# Decompositions of recently searched grids, keyed by Maze.wall_hash(),
+# shared by the threads of the dev server. A decomposition holds an entry
+# per cell, so the cache is bounded by board cells as well.
+MAX_CACHED_GRIDS = 32
+MAX_CACHED_CELLS = 1_000_000
+_cache = LRUCache(MAX_CACHED_GRIDS, MAX_CACHED_CELLS, size=lambda rectangles: len(rectangles.rect_of))
+
+
+class Rectangles:
+    """
+    Empty cells of a maze split into obstacle-free rectangles.
+
+    Rectangular Symmetry Reduction only searches the perimeter of each
+    rectangle. Macro-edges jump straight across a rectangle between opposite
+    sides, and every path through an interior has an equally short one along
+    the perimeter and those macro-edges, so searches stay optimal.
+    """
+
+    def __init__(self, maze):
+        self.rows = maze.rows
+        self.columns = maze.columns
+
+        # (top, left, bottom, right) of each rectangle, inclusive
+        self.rects = []
+
+        # Rectangle index of each cell in row-major order, -1 for walls
+        self.rect_of = [-1] * (maze.rows * maze.columns)
+
+        self._decompose(maze.maze)
+
+    def _decompose(self, grid):
+        rect_of = self.rect_of
+        rows, columns = self.rows, self.columns
+
+        # 1 for walls and cells already in a rectangle, checked a row or column slice at a time
+        taken = bytearray(cell == MazeSymbol.wall for row in grid for cell in row)
+
+        def column_free(col, top, bottom):
+            return not any(taken[top * columns + col:bottom * columns + col + 1:columns])
+
+        def row_free(row, left, right):
+            return not any(taken[row * columns + left:row * columns + right + 1])
+
+        def extend(top, left, bottom, right):
+            # Widen first, then lengthen, as far as whole free columns and rows allow
+            while right + 1 < columns and column_free(right + 1, top, bottom):
+                right += 1
+            while bottom + 1 < rows and row_free(bottom + 1, left, right):
+                bottom += 1
+            return bottom, right
+
+        def extend_down_first(top, left, bottom, right):
+            while bottom + 1 < rows and row_free(bottom + 1, left, right):
+                bottom += 1
+            while right + 1 < columns and column_free(right + 1, top, bottom):
+                right += 1
+            return bottom, right
+
+        def interior(top, left, corner):
+            bottom, right = corner
+            return max(0, bottom - top - 1) * max(0, right - left - 1), (bottom - top + 1) * (right - left + 1)
+
+        def place(top, left, bottom, right):
+            bottom, right = max(
+                extend(top, left, bottom, right),
+                extend_down_first(top, left, bottom, right),
+                key=lambda corner: interior(top, left, corner)
+            )
+            index = len(self.rects)
+            self.rects.append((top, left, bottom, right))
+            width = right - left + 1
+            for row in range(top, bottom + 1):
+                rect_of[row * columns + left:row * columns + right + 1] = [index] * width
+                taken[row * columns + left:row * columns + right + 1] = b'\x01' * width
+
+        # Side of the largest empty square with its top-left corner on each cell
+        square = [[0] * (columns + 1) for _ in range(rows + 1)]
+        for row in range(rows - 1, -1, -1):
+            below, here = square[row + 1], square[row]
+            for col in range(columns - 1, -1, -1):
+                if grid[row][col] != MazeSymbol.wall:
+                    here[col] = 1 + min(below[col], here[col + 1], below[col + 1])
+
+        # Only interior cells are pruned, so the largest squares are placed
+        # first. Growing every rectangle from the next free cell in row order
+        # instead leaves sparse obstacles cutting the free space into
+        # one-cell-thick strips with no interior at all.
+        corners = sorted(
+            ((square[row][col], row, col) for row in range(rows) for col in range(columns) if square[row][col] >= 3),
+            reverse=True
+        )
+        for side, top, left in corners:
+            if not taken[top * columns + left] and all(row_free(row, left, left + side - 1) for row in range(top, top + side)):
+                place(top, left, top + side - 1, left + side - 1)
+
+        # Whatever is left too narrow for an interior is covered in row order
+        for top in range(rows):
+            for left in range(columns):
+                if not taken[top * columns + left]:
+                    place(top, left, top, left)
+
+        interior_cells = sum(interior(top, left, (bottom, right))[0] for top, left, bottom, right in self.rects)
+        free_cells = sum(1 for index in rect_of if index != -1)
+        self.interior_ratio = interior_cells / free_cells if free_cells else 0.0
+
+    def rect(self, loc):
+        return self.rects[self.rect_of[loc.x * self.columns + loc.y]]
+
+    def on_perimeter(self, loc):
+        top, left, bottom, right = self.rect(loc)
+        return loc.x in (top, bottom) or loc.y in (left, right)
+
+    def projections(self, loc):
+        """Cells straight up, down, left and right of loc on its rectangle's perimeter"""
+        top, left, bottom, right = self.rect(loc)
+        return [
+            (Coordinate(top, loc.y), loc.x - top),
+            (Coordinate(bottom, loc.y), bottom - loc.x),
+            (Coordinate(loc.x, left), loc.y - left),
+            (Coordinate(loc.x, right), right - loc.y),
+        ]
+
+    def successors(self, maze, loc):
+        """
+        Perimeter moves out of loc as (neighbor, cost) pairs.
+
+        Moves into a rectangle's interior are dropped and replaced by the
+        macro-edge to the opposite side.
+        """
+        top, left, bottom, right = self.rect(loc)
+        successors = []
+
+        for neighbor in maze.get_neighbors(loc):
+            inside = top <= neighbor.x <= bottom and left <= neighbor.y <= right
+            if not inside or neighbor.x in (top, bottom) or neighbor.y in (left, right):
+                successors.append((neighbor, 1))
+
+        if bottom - top >= 2:
+            if loc.x == top: successors.append((Coordinate(bottom, loc.y), bottom - top))
+            if loc.x == bottom: successors.append((Coordinate(top, loc.y), bottom - top))
+        if right - left >= 2:
+            if loc.y == left: successors.append((Coordinate(loc.x, right), right - left))
+            if loc.y == right: successors.append((Coordinate(loc.x, left), right - left))
+
+        return successors
+
+
+def decompose(maze):
+    """Returns the rectangle decomposition of a maze, cached per wall layout"""
+    rectangles, _ = _cache.get(maze.wall_hash(), lambda: Rectangles(maze))
+    return rectangles
+
+
+def expand_path(nodes):
+    """
+    Fill in the cells skipped by macro-edges.
+
+    Consecutive nodes share a row or column, except a direct move between
+    two cells of the same rectangle which is walked vertically first.
+    """
+    if not nodes:
+        return []
+
+    cells = [nodes[0]]
+    for curr in nodes[1:]:
+        prev = cells[-1]
+        step_x = (curr.x > prev.x) - (curr.x < prev.x)
+        step_y = (curr.y > prev.y) - (curr.y < prev.y)
+        for x in range(prev.x + step_x, curr.x + step_x, step_x or 1):
+            cells.append(Coordinate(x, prev.y))
+        for y in range(prev.y + step_y, curr.y + step_y, step_y or 1):
+            cells.append(Coordinate(curr.x, y))
+    return cells
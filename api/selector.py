@@ -0,0 +1,187 @@
+import os
+import json
+from math import exp
+
+import numpy as np
+
+# Cost model fitted by `python -m api.benchmark calibrate`
+COST_MODEL_PATH = os.path.join(os.path.dirname(__file__), 'cost_model.json')
+
+# Engines auto mode picks from for each guarantee. On unit-cost grids BFS is
+# optimal as well. JPS and bidirectional search are left out, the first can
+# miss paths and the second can return invalid paths. RSR is left out too,
+# decomposing a board it has not seen costs more than A* on average.
+CANDIDATES = {
+    'optimal': ['astar', 'bfs', 'dijkstra'],
+    'any': ['astar', 'bfs', 'dijkstra', 'greedy', 'dfs'],
+}
+
+# Auto mode stays with A* unless another engine is predicted to take at most
+# this fraction of its time, smaller predicted gains are within the model's
+# error and do not pay for the board statistics
+DEFAULT_ENGINE = 'astar'
+SWITCH_MARGIN = 0.9
+
+# Order of the inputs the cost model weights
+FEATURES = ['logCells', 'density', 'corridorRatio', 'deadEndRatio', 'distance', 'corridorScale']
+
+# Model inputs that are not reported back under selection
+INTERNAL_FEATURES = {'logCells', 'corridorScale'}
+
+_model = None
+
+
+def _wall_array(walls):
+    """2D numpy bool array of a wall grid"""
+    if isinstance(walls, list):
+        # Packing the rows of a JSON grid of booleans as bytes is about twice
+        # as fast as letting numpy walk the nested lists
+        try:
+            packed = np.frombuffer(b''.join(bytes(row) for row in walls), dtype=np.uint8)
+            return (packed != 0).reshape(len(walls), len(walls[0]))
+        except (TypeError, ValueError):
+            pass
+    return np.asarray(walls, dtype=bool)
+
+
+def board_features(walls, start, end):
+    """
+    Cheap statistics of a board, computed with a few whole-array numpy operations.
+
+    Args:
+        walls: 2D array-like where truthy = wall
+        start: [row, col] of start position
+        end: [row, col] of end position
+
+    Returns:
+        Dict with rows, cols, logCells, density (wall fraction), corridorRatio
+        and deadEndRatio (open cells with exactly two and at most one open
+        neighbour), distance (start to end Manhattan distance over the
+        board's half perimeter) and corridorScale (logCells times
+        corridorRatio, corridors slow A* down more the larger the board)
+    """
+    walls = _wall_array(walls)
+    rows, cols = walls.shape
+
+    # Count the open neighbours of every cell by shifting a padded open mask
+    open_cells = np.pad(~walls, 1, constant_values=False)
+    degree = (
+        open_cells[:-2, 1:-1].astype(np.int8) + open_cells[2:, 1:-1]
+        + open_cells[1:-1, :-2] + open_cells[1:-1, 2:]
+    )
+    free = open_cells[1:-1, 1:-1]
+    free_count = max(int(free.sum()), 1)
+    corridor_ratio = round(int((free & (degree == 2)).sum()) / free_count, 4)
+
+    return {
+        "rows": rows,
+        "cols": cols,
+        "logCells": float(np.log(rows * cols)),
+        "density": round(1 - int(free.sum()) / (rows * cols), 4),
+        "corridorRatio": corridor_ratio,
+        "deadEndRatio": round(int((free & (degree <= 1)).sum()) / free_count, 4),
+        "distance": round((abs(end[0] - start[0]) + abs(end[1] - start[1])) / max(rows + cols - 2, 1), 4),
+        "corridorScale": round(float(np.log(rows * cols)) * corridor_ratio, 4)
+    }
+
+
+def fit_cost_model(samples):
+    """
+    Least-squares fit of log solve time against board features, per engine.
+
+    The spread of each engine's residuals is kept too, an engine whose time
+    varies a lot between similar boards costs more on average than the
+    fitted log time alone says.
+
+    Args:
+        samples: list of (features, engine, time in ms)
+
+    Returns:
+        Cost model dict as stored in cost_model.json
+    """
+    engines = sorted({engine for _, engine, _ in samples})
+    model = {"features": FEATURES, "engines": {}}
+    for engine in engines:
+        rows = [(features, time_taken) for features, name, time_taken in samples if name == engine]
+        x = np.array([[1.0] + [features[name] for name in FEATURES] for features, _ in rows])
+        y = np.log(np.array([max(time_taken, 1e-3) for _, time_taken in rows]))
+        weights, *_ = np.linalg.lstsq(x, y, rcond=None)
+        model["engines"][engine] = {
+            "weights": [round(float(w), 6) for w in weights],
+            "variance": round(float(np.var(y - x @ weights)), 6),
+            "samples": len(rows)
+        }
+    return model
+
+
+def load_cost_model(path=COST_MODEL_PATH):
+    """Read a cost model, the shipped one is only read once per process"""
+    global _model
+    if path != COST_MODEL_PATH:
+        with open(path) as f:
+            return json.load(f)
+    if _model is None:
+        with open(path) as f:
+            _model = json.load(f)
+    return _model
+
+
+def predict(model, features, engine):
+    """Predicted mean solve time in ms of an engine on a board"""
+    weights = model["engines"][engine]["weights"]
+    # Mean of a log-normal time, not its median
+    variance = model["engines"][engine].get("variance", 0.0)
+    return exp(weights[0] + sum(w * features[name] for w, name in zip(weights[1:], model["features"])) + variance / 2)
+
+
+def select_engine(features, guarantee='optimal', exclude=(), model=None):
+    """
+    Pick the engine predicted to be fastest for the guarantee.
+
+    Args:
+        features: output of board_features
+        guarantee: "optimal" for a shortest path or "any" for any path
+        exclude: engines that cannot be used for this request
+
+    Returns:
+        Dict with the chosen engine, the guarantee, the features, every
+        candidate's predicted time and a human-readable reason
+    """
+    model = model or load_cost_model()
+    if guarantee not in CANDIDATES:
+        raise ValueError(f"Unknown guarantee: {guarantee}")
+
+    candidates = [name for name in CANDIDATES[guarantee] if name in model["engines"] and name not in exclude]
+    predicted = {name: round(predict(model, features, name), 3) for name in candidates}
+    engine = min(candidates, key=predicted.get)
+
+    kept_default = (
+        DEFAULT_ENGINE in predicted and engine != DEFAULT_ENGINE
+        and predicted[engine] > SWITCH_MARGIN * predicted[DEFAULT_ENGINE]
+    )
+    if kept_default:
+        fastest, engine = engine, DEFAULT_ENGINE
+        summary = (
+            f"{engine} is kept as {fastest} is not predicted fast enough to switch "
+            f"({predicted[fastest]} ms against {predicted[engine]} ms"
+        )
+    else:
+        runner_up = sorted(candidates, key=predicted.get)[1:2]
+        summary = (
+            f"{engine} is predicted fastest for {'a shortest' if guarantee == 'optimal' else 'any'} path "
+            f"({predicted[engine]} ms"
+            + (f", next {runner_up[0]} at {predicted[runner_up[0]]} ms" if runner_up else "")
+        )
+    reason = (
+        summary
+        + f") on a {features['rows']}x{features['cols']} board with wall density {features['density']}, "
+        f"corridor ratio {features['corridorRatio']} and start-end distance {features['distance']}"
+    )
+
+    return {
+        "engine": engine,
+        "guarantee": guarantee,
+        "features": {name: value for name, value in features.items() if name not in INTERNAL_FEATURES},
+        "predicted": predicted,
+        "reason": reason
+    }
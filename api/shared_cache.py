@@ -0,0 +1,226 @@
+import os
+import mmap
+import struct
+import hashlib
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, the cache is disabled there
+    fcntl = None
+
+# Path of the cache file shared by every worker, the cache is off when unset
+CACHE_PATH = os.environ.get('PATHVIZ_CACHE_PATH')
+CACHE_SLOTS = int(os.environ.get('PATHVIZ_CACHE_SLOTS', 1024))
+CACHE_SLOT_SIZE = int(os.environ.get('PATHVIZ_CACHE_SLOT_SIZE', 64 * 1024))
+
+MAGIC = b'PVC2'
+WAYS = 8
+
+# magic, sets, ways, slot size, clock, hits, misses, stores, evictions, build
+HEADER = struct.Struct('<4sIII5Q8s')
+HEADER_SIZE = 64
+COUNTERS = struct.Struct('<5Q')
+COUNTERS_OFFSET = 16
+
+# key digest, last use stamp (0 = empty), value length
+SLOT = struct.Struct('<16sQI')
+SLOT_HEADER_SIZE = 32
+
+
+def _build_token():
+    """
+    Digest of the code and data behind the cached responses.
+
+    PATHVIZ_BUILD names the build explicitly (e.g. a release or commit id),
+    otherwise the api package's modules and cost model are hashed, so any
+    deploy that can change a response starts a fresh cache.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    build = os.environ.get('PATHVIZ_BUILD')
+    if build:
+        digest.update(build.encode())
+        return digest.digest()
+
+    api_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(api_dir)):
+        if name.endswith(('.py', '.json')):
+            with open(os.path.join(api_dir, name), 'rb') as f:
+                digest.update(name.encode() + b'\0' + f.read())
+    return digest.digest()
+
+
+BUILD = _build_token()
+
+
+class SharedCache:
+    """
+    Fixed-size LRU cache in a memory-mapped file, shared by all processes that open it.
+
+    Keys are hashed into sets of WAYS slots, and a full set evicts its least
+    recently used slot, so both the index and the file stay bounded. Every
+    operation holds an exclusive flock on the file (plus a thread lock, as
+    flock does not separate threads of one process). Hit and miss counters
+    live in the file header, so the stats cover every worker.
+    """
+
+    def __init__(self, path, slots=CACHE_SLOTS, slot_size=CACHE_SLOT_SIZE):
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._map = None
+
+        while self._map is None:
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                # Another worker may have swapped in a fresh file while this one waited
+                if os.fstat(self._fd).st_ino != os.stat(path).st_ino:
+                    continue
+
+                header = os.pread(self._fd, HEADER.size, 0)
+                if len(header) == HEADER.size and header[:4] == MAGIC and HEADER.unpack(header)[9] == BUILD:
+                    # Reuse the layout of an existing file, whatever this worker was configured with
+                    _, self.sets, self.ways, self.slot_size = HEADER.unpack(header)[:4]
+                else:
+                    self.sets, self.ways, self.slot_size = max(1, slots // WAYS), WAYS, slot_size
+                    if os.fstat(self._fd).st_size:
+                        # Written by another build or format, responses in it may be stale.
+                        # Workers of that build may still map it, so it is replaced, not truncated.
+                        self._replace_file()
+                        continue
+                    self._initialize(self._fd)
+
+                self._map = mmap.mmap(self._fd, self._file_size())
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+                if self._map is None:
+                    os.close(self._fd)
+
+    def _initialize(self, fd):
+        os.ftruncate(fd, self._file_size())
+        os.pwrite(fd, HEADER.pack(MAGIC, self.sets, self.ways, self.slot_size, 0, 0, 0, 0, 0, BUILD), 0)
+
+    def _replace_file(self):
+        """Atomically put an empty cache file for this build at self.path"""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            self._initialize(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, self.path)
+
+    def _file_size(self):
+        return HEADER_SIZE + self.sets * self.ways * (SLOT_HEADER_SIZE + self.slot_size)
+
+    def _slot_offset(self, index):
+        return HEADER_SIZE + index * (SLOT_HEADER_SIZE + self.slot_size)
+
+    @contextmanager
+    def _locked(self):
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _counters(self):
+        return list(COUNTERS.unpack_from(self._map, COUNTERS_OFFSET))
+
+    def _set_counters(self, counters):
+        COUNTERS.pack_into(self._map, COUNTERS_OFFSET, *counters)
+
+    def _find(self, digest):
+        """Slot indices of the key's set and the index holding the key, if any"""
+        first = int.from_bytes(digest[:8], 'little') % self.sets * self.ways
+        indices = range(first, first + self.ways)
+        for index in indices:
+            key, stamp, _ = SLOT.unpack_from(self._map, self._slot_offset(index))
+            if stamp and key == digest:
+                return indices, index
+        return indices, None
+
+    def get(self, key):
+        """Returns the cached bytes for key, or None"""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        with self._locked():
+            clock, hits, misses, stores, evictions = self._counters()
+            _, index = self._find(digest)
+            if index is None:
+                self._set_counters([clock, hits, misses + 1, stores, evictions])
+                return None
+
+            offset = self._slot_offset(index)
+            _, _, length = SLOT.unpack_from(self._map, offset)
+            SLOT.pack_into(self._map, offset, digest, clock + 1, length)
+            self._set_counters([clock + 1, hits + 1, misses, stores, evictions])
+
+            start = offset + SLOT_HEADER_SIZE
+            return bytes(self._map[start:start + length])
+
+    def put(self, key, value):
+        """
+        Store bytes under key, evicting the least recently used entry of its set.
+
+        Returns:
+            False if the value is larger than a slot and was not stored
+        """
+        if len(value) > self.slot_size:
+            return False
+
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        with self._locked():
+            clock, hits, misses, stores, evictions = self._counters()
+            indices, index = self._find(digest)
+            if index is None:
+                slots = [(SLOT.unpack_from(self._map, self._slot_offset(i))[1], i) for i in indices]
+                stamp, index = min(slots)
+                evictions += stamp != 0
+
+            offset = self._slot_offset(index)
+            start = offset + SLOT_HEADER_SIZE
+            self._map[start:start + len(value)] = value
+            SLOT.pack_into(self._map, offset, digest, clock + 1, len(value))
+            self._set_counters([clock + 1, hits, misses, stores + 1, evictions])
+            return True
+
+    def stats(self):
+        with self._locked():
+            _, hits, misses, stores, evictions = self._counters()
+            entries = sum(
+                1 for index in range(self.sets * self.ways)
+                if SLOT.unpack_from(self._map, self._slot_offset(index))[1]
+            )
+
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hitRate": round(hits / lookups, 4) if lookups else None,
+            "stores": stores,
+            "evictions": evictions,
+            "entries": entries,
+            "capacity": self.sets * self.ways,
+            "slotSize": self.slot_size,
+            "build": BUILD.hex()
+        }
+
+
+# Cache opened by this process, reopened after a fork so locks are not shared
+_cache = None
+_cache_pid = None
+_open_lock = threading.Lock()
+
+
+def get_cache():
+    """Returns this process's handle on the shared cache, or None when it is disabled"""
+    global _cache, _cache_pid
+    if not CACHE_PATH or fcntl is None:
+        return None
+    with _open_lock:
+        if _cache_pid != os.getpid():
+            _cache = SharedCache(CACHE_PATH)
+            _cache_pid = os.getpid()
+    return _cache
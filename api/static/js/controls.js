@@ -34,15 +34,22 @@ class VisualizerControls {
                     algorithm: algorithmName,
                     grid: mazeState.grid,
                     start: mazeState.start,
-                    end: mazeState.end
+                    end: mazeState.end,
+                    // Let the server batch the visited trace into a bounded animation
+                    fps: 1000 / this.grid.animationSpeed,
+                    duration: this.grid.maxAnimationDuration
                 })
             });
 
             const result = await response.json();
 
             if (result.success) {
-                // Animate the path
-                await this.grid.animatePath(result.visited, result.path);
+                // Animate the path, cell by cell if the server sent the raw trace
+                if (result.frames) {
+                    await this.grid.animateFrames(result.frames, result.path);
+                } else {
+                    await this.grid.animatePath(result.visited, result.path);
+                }
 
                 // Update statistics
                 this.updateStats({
@@ -9,6 +9,7 @@ class PathGrid {
         this.container = document.getElementById(containerId);
         this.cells = [];
         this.animationSpeed = 50; // milliseconds per cell animation
+        this.maxAnimationDuration = 10; // seconds, upper bound on visited playback
 
         // Grid state - dynamic end position based on grid size
         this.state = {
@@ -338,6 +339,53 @@ class PathGrid {
         }
     }
 
+    /**
+     * Animate a server-batched visited trace followed by the final path
+     */
+    async animateFrames(frames, pathCells) {
+        // Clear previous visualization
+        this.clearVisualization();
+
+        // Paint one frame of visited cells per tick
+        if (frames && frames.length > 0) {
+            await new Promise((resolve) => {
+                let index = 0;
+
+                const animate = () => {
+                    if (index >= frames.length) {
+                        resolve();
+                        return;
+                    }
+
+                    this.paintCells(frames[index], 'cell-visited');
+                    index += 1;
+                    setTimeout(animate, this.animationSpeed);
+                };
+
+                animate();
+            });
+        }
+
+        // Animate final path
+        if (pathCells && pathCells.length > 0) {
+            await this.animateCells(pathCells, 'cell-path');
+        }
+    }
+
+    /**
+     * Add a class to a list of cells, skipping start and end markers
+     */
+    paintCells(cells, className) {
+        cells.forEach(([row, col]) => {
+            const cell = this.getCell(row, col);
+            // Don't override start/end cells
+            if (!cell.classList.contains('cell-start') &&
+                !cell.classList.contains('cell-end')) {
+                cell.classList.add(className);
+            }
+        });
+    }
+
     /**
      * Animate a list of cells with a specific class
      */